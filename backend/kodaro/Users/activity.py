@@ -0,0 +1,94 @@
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+logger = logging.getLogger("kodaro.activity")
+
+User = get_user_model()
+
+
+class LastLoginRecorder:
+    """
+    Per-process buffer of last-login timestamps, written with one bulk UPDATE per
+    USERS_BULK_CHUNK_SIZE users instead of one UPDATE per login.
+    Only the latest login per user is kept. The buffer is flushed USERS_LAST_LOGIN_FLUSH_INTERVAL
+    seconds after its first entry by a background timer, inline once it holds
+    USERS_LAST_LOGIN_BUFFER_SIZE users, and at interpreter exit. An interval of 0 (the
+    default under `manage.py test`) writes every login inline, with no timer thread.
+    `bulk_update` writes last_login only, so updated_at (auto_now) and the profile cache
+    are left alone. A worker killed without a normal exit loses at most one interval of logins.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def record(self, user_id, when=None):
+        with self._lock:
+            self._pending[user_id] = when or timezone.now()
+            full = (
+                not settings.USERS_LAST_LOGIN_FLUSH_INTERVAL
+                or len(self._pending) >= settings.USERS_LAST_LOGIN_BUFFER_SIZE
+            )
+            if not full and self._timer is None:
+                self._timer = threading.Timer(settings.USERS_LAST_LOGIN_FLUSH_INTERVAL, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Write every buffered timestamp; returns how many users were updated."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return 0
+        try:
+            return User.objects.bulk_update(
+                [User(pk=user_id, last_login=when) for user_id, when in pending.items()],
+                ["last_login"],
+                batch_size=settings.USERS_BULK_CHUNK_SIZE,
+            )
+        except Exception:
+            logger.exception("Writing %d buffered last_login values failed", len(pending))
+            with self._lock:
+                # Keep newer logins recorded meanwhile; retry the rest with the next flush.
+                for user_id, when in pending.items():
+                    if len(self._pending) >= settings.USERS_LAST_LOGIN_BUFFER_SIZE:
+                        break
+                    self._pending.setdefault(user_id, when)
+            return 0
+
+    def discard(self):
+        """Drop buffered timestamps without writing them (e.g. after a rolled-back benchmark)."""
+        with self._lock:
+            self._pending.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _flush_in_background(self):
+        close_old_connections()
+        try:
+            self.flush()
+        finally:
+            # The timer thread's connection would otherwise stay open until the process exits.
+            connection.close()
+
+
+last_login_recorder = LastLoginRecorder()
+atexit.register(last_login_recorder.flush)
+
+
+def record_last_login(sender, user, **kwargs):
+    """user_logged_in receiver replacing django.contrib.auth's update_last_login."""
+    last_login_recorder.record(user.pk)
@@ -1,7 +1,11 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth import get_user_model
 
+from api.pagination import EstimatedCountPaginator
+from .bulk import apply_bulk_action
+from .search import filter_email_prefix
+
 User = get_user_model()
 
 @admin.register(User)
@@ -9,7 +13,10 @@ class UserAdmin(BaseUserAdmin):
     ordering = ["-date_joined"]
     list_display = ["email", "first_name", "last_name", "is_staff", "is_active", "date_joined"]
     list_filter = ["is_staff", "is_active", "is_superuser"]
-    search_fields = ["email", "first_name", "last_name"]
+    search_fields = ["email"]
+    # Totals come from planner statistics instead of COUNT(*) on every changelist page.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     fieldsets = (
         (None, {"fields": ("email", "password")}),
@@ -25,4 +32,46 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
 
-    readonly_fields = ["date_joined", "last_login"]
\ No newline at end of file
+    readonly_fields = ["date_joined", "last_login"]
+
+    actions = ["activate_users", "deactivate_users", "grant_staff", "revoke_staff"]
+
+    # Single and bulk deletes go through Users.bulk: chunked DELETEs that also blacklist
+    # refresh tokens and invalidate the cached user state and users/ listing validators.
+    def delete_model(self, request, obj):
+        apply_bulk_action("delete", [obj.pk])
+
+    def delete_queryset(self, request, queryset):
+        apply_bulk_action("delete", list(queryset.values_list("pk", flat=True)))
+
+    def run_bulk_action(self, request, queryset, action, verb):
+        ids = [pk for pk in queryset.values_list("pk", flat=True) if pk != request.user.pk]
+        matched, blacklisted = apply_bulk_action(action, ids)
+        message = f"{matched} user(s) {verb}."
+        if blacklisted:
+            message += f" {blacklisted} refresh token(s) blacklisted."
+        self.message_user(request, message, messages.SUCCESS)
+
+    @admin.action(description="Activate selected users", permissions=["change"])
+    def activate_users(self, request, queryset):
+        self.run_bulk_action(request, queryset, "activate", "activated")
+
+    @admin.action(description="Deactivate selected users", permissions=["change"])
+    def deactivate_users(self, request, queryset):
+        self.run_bulk_action(request, queryset, "deactivate", "deactivated")
+
+    @admin.action(description="Grant staff status to selected users", permissions=["change"])
+    def grant_staff(self, request, queryset):
+        self.run_bulk_action(request, queryset, "grant_staff", "granted staff status")
+
+    @admin.action(description="Revoke staff status from selected users", permissions=["change"])
+    def revoke_staff(self, request, queryset):
+        self.run_bulk_action(request, queryset, "revoke_staff", "had staff status revoked")
+
+    def get_search_results(self, request, queryset, search_term):
+        # Search is an email prefix match so it can use the unique email index
+        # rather than icontains scans over several columns.
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        return filter_email_prefix(queryset, search_term), False
\ No newline at end of file
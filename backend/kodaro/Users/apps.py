@@ -3,3 +3,14 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     name = 'Users'
+
+    def ready(self):
+        from django.contrib.auth.models import update_last_login
+        from django.contrib.auth.signals import user_logged_in
+
+        from . import signals  # noqa: F401
+        from .activity import record_last_login
+
+        # Session logins (the admin) go through the same buffered recorder as JWT logins.
+        user_logged_in.disconnect(update_last_login, dispatch_uid="update_last_login")
+        user_logged_in.connect(record_last_login, dispatch_uid="record_last_login")
@@ -0,0 +1,109 @@
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from api.async_views import AsyncAPIView
+from api.pagination import estimate_count
+from .cache import user_profile_cache
+from .search import filter_users
+from .serializers import UserSerializer
+
+User = get_user_model()
+
+
+class AsyncProfileView(AsyncAPIView):
+    """Serves a user's profile from user_profile_cache, loading it on a miss."""
+
+    async def profile(self, request, user_id):
+        entry = await user_profile_cache.aget(user_id)
+        if entry is None:
+            try:
+                user = await User.objects.aget(pk=user_id)
+            except User.DoesNotExist:
+                return self.error({"detail": "No User matches the given query."}, status=404)
+            entry = await user_profile_cache.aset(user)
+        etag, data = entry
+        response = get_conditional_response(request, etag=etag) or self.respond(data)
+        response["ETag"] = etag
+        return response
+
+
+class AsyncMeView(AsyncProfileView):
+    """
+    GET /async/users/me/   → Return the authenticated user's profile (cached per user).
+    """
+
+    async def get(self, request):
+        return await self.profile(request, request.user.id)
+
+
+class AsyncUserListView(AsyncAPIView):
+    """
+    GET /async/users/   → List users newest first (admin only), keyset-paginated on (date_joined, id)
+                          like users/ and read with aiterator(). `?after=` takes the cursor from the
+                          previous page's `next` link; `?page_size=`, the users/ filters and
+                          `?count=exact|estimate` behave as on users/.
+    """
+    admin_only = True
+
+    async def get(self, request):
+        page_size = self.get_page_size(request)
+        users = filter_users(User.objects.all(), request.GET)
+        count = await self.get_count(request, users)
+        if request.GET.get("after"):
+            joined, pk = self.parse_cursor(request.GET["after"])
+            users = users.filter(Q(date_joined__lt=joined) | Q(date_joined=joined, id__lt=pk))
+
+        rows = UserSerializer.values_queryset(users.order_by("-date_joined", "-id")[:page_size + 1])
+        results = list(UserSerializer.values_rows([row async for row in rows.aiterator()]))
+        has_next = len(results) > page_size
+        results = results[:page_size]
+
+        next_url = None
+        if has_next:
+            query = request.GET.copy()
+            query["after"] = f"{results[-1]['date_joined'].isoformat()},{results[-1]['id']}"
+            next_url = request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+        data = {"next": next_url, "results": results}
+        return self.respond(data if count is None else {"count": count, **data})
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.GET.get("page_size", settings.USERS_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError({"page_size": "A valid integer is required."})
+        return max(1, min(page_size, settings.USERS_MAX_PAGE_SIZE))
+
+    async def get_count(self, request, users):
+        mode = request.GET.get("count")
+        if mode == "exact":
+            return await users.acount()
+        if mode == "estimate":
+            return await sync_to_async(estimate_count)(users)
+        return None
+
+    def parse_cursor(self, raw):
+        joined, _, pk = raw.rpartition(",")
+        try:
+            joined, pk = parse_datetime(joined), uuid.UUID(pk)
+        except ValueError:
+            joined = None
+        if joined is None:
+            raise ValidationError({"after": "Invalid cursor."})
+        return joined, pk
+
+
+class AsyncUserDetailView(AsyncProfileView):
+    """
+    GET /async/users/<id>/   → Retrieve a user (admin only, cached per user).
+    """
+    admin_only = True
+
+    async def get(self, request, pk):
+        return await self.profile(request, pk)
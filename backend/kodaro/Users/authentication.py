@@ -0,0 +1,147 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+
+class ClaimsUser(TokenUser):
+    """
+    Token-backed user exposing the claims added by CustomTokenObtainPairSerializer.
+    `is_active` / `is_staff` come from UserStatusCache rather than the token, so a
+    deactivation or demotion takes effect within JWT_USER_STATUS_TTL seconds.
+    """
+
+    def __init__(self, token, is_active=True, is_staff=False):
+        super().__init__(token)
+        self.is_active = is_active
+        self.is_staff = is_staff
+
+    def __str__(self):
+        return self.email
+
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+    @cached_property
+    def full_name(self):
+        return self.token.get("full_name", "") or self.email
+
+
+class UserStatusCache:
+    """
+    Per-process TTL cache of `(is_active, is_staff)` keyed by user id.
+    One indexed primary-key lookup per user per TTL replaces the full row load
+    JWTAuthentication performs on every request.
+    """
+
+    MISS = object()
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        user_id = str(user_id)
+        status = self._lookup(user_id)
+        if status is self.MISS:
+            status = self._store(user_id, self._query(user_id).first())
+        return status
+
+    async def aget(self, user_id):
+        """get() for async callers, using the async ORM on a miss."""
+        user_id = str(user_id)
+        status = self._lookup(user_id)
+        if status is self.MISS:
+            status = self._store(user_id, await self._query(user_id).afirst())
+        return status
+
+    def _lookup(self, user_id):
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return self.MISS
+
+    def _query(self, user_id):
+        return User.objects.filter(pk=user_id).values_list("is_active", "is_staff")
+
+    def _store(self, user_id, status):
+        with self._lock:
+            if len(self._entries) >= settings.JWT_USER_STATUS_MAX_ENTRIES:
+                self._entries.clear()
+            self._entries[user_id] = (time.monotonic() + settings.JWT_USER_STATUS_TTL, status)
+        return status
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_status_cache = UserStatusCache()
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication for read-mostly endpoints.
+    Safe requests (GET/HEAD/OPTIONS) get a ClaimsUser built from the token plus the
+    cached status flags, so they cost no User query; unsafe requests load the User row
+    exactly like JWTAuthentication.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if request.method in SAFE_METHODS:
+            return self.get_token_user(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    def get_token_user(self, validated_token):
+        return self.build_token_user(validated_token, user_status_cache.get(self.get_user_id(validated_token)))
+
+    async def aauthenticate(self, request):
+        """
+        authenticate() for async views: token parsing is pure CPU, and the status
+        lookup goes through the async ORM. Always returns a ClaimsUser.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        status = await user_status_cache.aget(self.get_user_id(validated_token))
+        return self.build_token_user(validated_token, status), validated_token
+
+    def get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+    def build_token_user(self, validated_token, status):
+        if status is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        is_active, is_staff = status
+        if api_settings.CHECK_USER_IS_ACTIVE and not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return ClaimsUser(validated_token, is_active=is_active, is_staff=is_staff)
@@ -0,0 +1,117 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+    `key in bloom` is False only if the key was never added; True may be a false
+    positive at roughly `error_rate` once `capacity` keys have been added.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class TokenBlacklist:
+    """
+    Blacklist lookups for refresh-token JTIs, consulted before the token_blacklist tables.
+
+    1. A cache entry per blacklisted JTI (JWT_BLACKLIST_CACHE_ALIAS) answers positives.
+       Entries are written on blacklist and live until the token would expire anyway.
+    2. With JWT_BLACKLIST_BLOOM enabled, a per-process Bloom filter of all unexpired
+       blacklisted JTIs answers negatives without a query. It is rebuilt from the DB every
+       JWT_BLACKLIST_BLOOM_REFRESH seconds; tokens blacklisted by other workers in between
+       are caught by step 1, so use a shared cache backend when enabling it.
+    3. Anything else falls through to the database, and positives found there are cached.
+    """
+
+    def __init__(self):
+        self._bloom = None
+        self._bloom_expires = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[settings.JWT_BLACKLIST_CACHE_ALIAS]
+
+    @staticmethod
+    def key(jti):
+        return f"jwt:blacklisted:{jti}"
+
+    @staticmethod
+    def _ttl(exp):
+        return max(int(exp - aware_utcnow().timestamp()), 1)
+
+    def add(self, jti, exp):
+        self.cache.set(self.key(jti), True, timeout=self._ttl(exp))
+        bloom = self._bloom
+        if bloom is not None:
+            bloom.add(jti)
+
+    def add_many(self, tokens):
+        """Cache a batch of `(jti, exp)` pairs, e.g. after a bulk blacklist."""
+        now = aware_utcnow().timestamp()
+        by_ttl = {}
+        for jti, exp in tokens:
+            by_ttl.setdefault(max(int(exp - now), 1), {})[self.key(jti)] = True
+        for ttl, entries in by_ttl.items():
+            self.cache.set_many(entries, timeout=ttl)
+        bloom = self._bloom
+        if bloom is not None:
+            for jti, _ in tokens:
+                bloom.add(jti)
+
+    def contains(self, jti, exp):
+        if self.cache.get(self.key(jti)):
+            return True
+        bloom = self.get_bloom()
+        if bloom is not None and jti not in bloom:
+            return False
+        blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+        if blacklisted:
+            self.cache.set(self.key(jti), True, timeout=self._ttl(exp))
+        return blacklisted
+
+    def get_bloom(self):
+        if not settings.JWT_BLACKLIST_BLOOM:
+            return None
+        if self._bloom is None or time.monotonic() >= self._bloom_expires:
+            with self._lock:
+                if self._bloom is None or time.monotonic() >= self._bloom_expires:
+                    self._bloom = self._build_bloom()
+                    self._bloom_expires = time.monotonic() + settings.JWT_BLACKLIST_BLOOM_REFRESH
+        return self._bloom
+
+    def _build_bloom(self):
+        jtis = BlacklistedToken.objects.filter(token__expires_at__gt=aware_utcnow()).values_list("token__jti", flat=True)
+        bloom = BloomFilter(settings.JWT_BLACKLIST_BLOOM_CAPACITY, settings.JWT_BLACKLIST_BLOOM_ERROR_RATE)
+        for jti in jtis.iterator(chunk_size=5000):
+            bloom.add(jti)
+        return bloom
+
+
+token_blacklist = TokenBlacklist()
@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from .authentication import user_status_cache
+from .blacklist import token_blacklist
+from .cache import user_profile_cache, users_version
+
+User = get_user_model()
+
+# Bulk action → column changes applied with one UPDATE per chunk of ids.
+BULK_UPDATES = {
+    "activate": {"is_active": True},
+    "deactivate": {"is_active": False},
+    "grant_staff": {"is_staff": True},
+    "revoke_staff": {"is_staff": False},
+}
+# Actions after which the users' refresh tokens must stop working.
+REVOKING_ACTIONS = {"deactivate", "delete"}
+
+
+def _chunks(ids, size):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def blacklist_user_tokens(user_ids):
+    """
+    Blacklist every unexpired, not yet blacklisted refresh token of `user_ids` with one
+    INSERT per chunk, and record them in the blacklist cache. Returns how many were added.
+    """
+    total = 0
+    for chunk in _chunks(user_ids, settings.USERS_BULK_CHUNK_SIZE):
+        tokens = list(
+            OutstandingToken.objects.filter(user_id__in=chunk, expires_at__gt=aware_utcnow(), blacklistedtoken__isnull=True)
+            .values_list("id", "jti", "expires_at")
+        )
+        BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(token_id=token_id) for token_id, _, _ in tokens], ignore_conflicts=True
+        )
+        token_blacklist.add_many([(jti, expires_at.timestamp()) for _, jti, expires_at in tokens])
+        total += len(tokens)
+    return total
+
+
+def _invalidate(user_ids):
+    # .update() and bulk deletes send no signals, so drop cached state explicitly.
+    for user_id in user_ids:
+        user_status_cache.invalidate(user_id)
+    user_profile_cache.invalidate(user_ids)
+    users_version.bump_on_commit()
+
+
+def bulk_update_users(action, user_ids):
+    """
+    Apply a BULK_UPDATES action to `user_ids` with one `UPDATE … WHERE id IN (…)` per
+    USERS_BULK_CHUNK_SIZE ids, in a single transaction. Returns `(matched, tokens_blacklisted)`.
+    """
+    changes = BULK_UPDATES[action]
+    matched = blacklisted = 0
+    with transaction.atomic():
+        for chunk in _chunks(user_ids, settings.USERS_BULK_CHUNK_SIZE):
+            # updated_at is auto_now, which .update() does not apply by itself.
+            matched += User.objects.filter(id__in=chunk).update(**changes, updated_at=timezone.now())
+        if action in REVOKING_ACTIONS:
+            blacklisted = blacklist_user_tokens(user_ids)
+        _invalidate(user_ids)
+    return matched, blacklisted
+
+
+def bulk_delete_users(user_ids):
+    """
+    Delete `user_ids` in chunks of USERS_BULK_CHUNK_SIZE, each in its own short transaction,
+    after blacklisting their refresh tokens. Returns `(deleted, tokens_blacklisted)`.
+    """
+    deleted = blacklisted = 0
+    for chunk in _chunks(user_ids, settings.USERS_BULK_CHUNK_SIZE):
+        with transaction.atomic():
+            blacklisted += blacklist_user_tokens(chunk)
+            deleted += User.objects.filter(id__in=chunk).delete()[1].get(User._meta.label, 0)
+            _invalidate(chunk)
+    return deleted, blacklisted
+
+
+def apply_bulk_action(action, user_ids):
+    if action == "delete":
+        return bulk_delete_users(user_ids)
+    return bulk_update_users(action, user_ids)
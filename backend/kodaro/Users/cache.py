@@ -0,0 +1,85 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Max
+
+from api.cache import TableVersion
+from api.instrumentation import incr
+from .serializers import UserSerializer
+
+User = get_user_model()
+
+# Bumped by paths that change users without moving max(updated_at): deletes and queryset updates.
+users_version = TableVersion("users")
+
+
+def users_list_etag(request):
+    """
+    ETag for a users listing.
+    max(updated_at) moves on every save and is a single lookup on users_updated_idx;
+    together with users_version it covers every change, so any write invalidates
+    every page/filter combination at once — coarse, but checked without touching rows.
+    No Last-Modified is derived from it: deletes don't move max(updated_at), and its
+    one-second granularity would hide writes made within the same second.
+    """
+    last_modified = User.objects.aggregate(last=Max("updated_at"))["last"]
+    state = last_modified.isoformat() if last_modified else ""
+    target = f"{request.build_absolute_uri()} {getattr(request, 'accepted_media_type', '')} {state} {users_version.get()}"
+    return f'"{hashlib.sha1(target.encode()).hexdigest()}"'
+
+
+class UserProfileCache:
+    """
+    UserSerializer output per user, in the USERS_CACHE_ALIAS cache.
+    Entries are `(etag, data)` under the user's id; the ETag is derived from the id and
+    updated_at, so a hit answers a profile load, conditional or not, without the ORM or
+    the serializer. The key is the id alone because a lookup can't know updated_at without
+    the query the cache exists to avoid; instead entries are deleted when a user is saved,
+    deleted or bulk-updated (see Users.signals and Users.bulk). Deletes only reach other
+    workers through a shared backend; with local memory they serve a stale entry until it
+    expires. Hits and misses are counted per endpoint in /metrics/.
+    """
+    prefix = "users:profile"
+
+    @property
+    def cache(self):
+        return caches[settings.USERS_CACHE_ALIAS]
+
+    def key(self, user_id):
+        return f"{self.prefix}:{user_id}"
+
+    def entry(self, user):
+        state = f"{user.pk} {user.updated_at.isoformat()}"
+        return f'"{hashlib.sha1(state.encode()).hexdigest()}"', UserSerializer(user).data
+
+    def count(self, entry):
+        incr("profile_cache_misses" if entry is None else "profile_cache_hits")
+        return entry
+
+    def get(self, user_id):
+        return self.count(self.cache.get(self.key(user_id)))
+
+    async def aget(self, user_id):
+        return self.count(await self.cache.aget(self.key(user_id)))
+
+    def set(self, user):
+        entry = self.entry(user)
+        self.cache.set(self.key(user.pk), entry, timeout=settings.USERS_PROFILE_CACHE_TIMEOUT)
+        return entry
+
+    async def aset(self, user):
+        entry = self.entry(user)
+        await self.cache.aset(self.key(user.pk), entry, timeout=settings.USERS_PROFILE_CACHE_TIMEOUT)
+        return entry
+
+    def invalidate(self, user_ids):
+        """Drop the entries once the current transaction commits; deleting earlier would let
+        a concurrent miss re-cache the old row before the commit."""
+        keys = [self.key(user_id) for user_id in user_ids]
+        transaction.on_commit(lambda: self.cache.delete_many(keys))
+
+
+user_profile_cache = UserProfileCache()
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+
+def _cost(name, param, default):
+    value = settings.PASSWORD_HASHING_COST.get(name, {}).get(param)
+    return default if value is None else value
+
+
+# Each hasher keeps Django's algorithm name, so hashes written by the stock hashers
+# still verify, and `must_update` compares against the tuned parameters: changing a
+# cost in settings rehashes each user's password on their next successful login.
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with `PASSWORD_HASHING_COST["pbkdf2"]["iterations"]`."""
+
+    @property
+    def iterations(self):
+        return _cost("pbkdf2", "iterations", PBKDF2PasswordHasher.iterations)
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """Scrypt with `work_factor` / `block_size` / `parallelism` from `PASSWORD_HASHING_COST["scrypt"]`."""
+
+    @property
+    def work_factor(self):
+        return _cost("scrypt", "work_factor", ScryptPasswordHasher.work_factor)
+
+    @property
+    def block_size(self):
+        return _cost("scrypt", "block_size", ScryptPasswordHasher.block_size)
+
+    @property
+    def parallelism(self):
+        return _cost("scrypt", "parallelism", ScryptPasswordHasher.parallelism)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with `time_cost` / `memory_cost` / `parallelism` from `PASSWORD_HASHING_COST["argon2"]`.
+    Requires the optional argon2-cffi package.
+    """
+
+    @property
+    def time_cost(self):
+        return _cost("argon2", "time_cost", Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return _cost("argon2", "memory_cost", Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return _cost("argon2", "parallelism", Argon2PasswordHasher.parallelism)
@@ -0,0 +1,43 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Bounded pool that password hashing is offloaded to from async code.
+    The stock hashers release the GIL while hashing, so threads give real parallelism;
+    PASSWORD_HASHING_EXECUTOR = "process" is available for hashers that don't.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                pool_class = ProcessPoolExecutor if settings.PASSWORD_HASHING_EXECUTOR == "process" else ThreadPoolExecutor
+                kwargs = {"thread_name_prefix": "password-hashing"} if pool_class is ThreadPoolExecutor else {}
+                _executor = pool_class(max_workers=settings.PASSWORD_HASHING_WORKERS, **kwargs)
+    return _executor
+
+
+async def amake_password(password):
+    """make_password() without blocking the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), make_password, password)
+
+
+async def acheck_password(user, password):
+    """
+    user.check_password() without blocking the event loop: verification (and the
+    rehash when the preferred hasher or its cost changed) runs in the hashing pool.
+    """
+    loop = asyncio.get_running_loop()
+    is_correct, must_update = await loop.run_in_executor(get_executor(), verify_password, password, user.password)
+    if is_correct and must_update:
+        user.password = await amake_password(password)
+        await user.asave(update_fields=["password"])
+    return is_correct
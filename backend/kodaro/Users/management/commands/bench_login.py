@@ -0,0 +1,68 @@
+import asyncio
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from Users.hashing import acheck_password
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure password-verification and POST /api/auth/login/ throughput with the configured "
+        "hasher (KODARO_PASSWORD_HASHER and its cost settings), sequentially and through the "
+        "async hashing pool. A temporary user is created and removed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20, help="Password checks / logins per run.")
+        parser.add_argument("--concurrency", type=int, default=settings.PASSWORD_HASHING_WORKERS,
+                            help="Concurrent checks submitted to the hashing pool.")
+
+    def handle(self, *args, **options):
+        n = options["iterations"]
+        password = uuid.uuid4().hex
+        user = User.objects.create_user(f"bench-login-{uuid.uuid4().hex}@example.invalid", password)
+        self.stdout.write(f"hasher={settings.PASSWORD_HASHERS[0]} workers={settings.PASSWORD_HASHING_WORKERS}")
+
+        try:
+            start = time.perf_counter()
+            for _ in range(n):
+                user.check_password(password)
+            self.report("check_password (sequential)", n, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            asyncio.run(self.run_pool(user, password, n, options["concurrency"]))
+            self.report(f"acheck_password (pool, concurrency={options['concurrency']})", n, time.perf_counter() - start)
+
+            client = Client(HTTP_HOST="localhost")
+            # Every login comes from one address and email, so the login throttles would cut the run short.
+            with override_settings(THROTTLE_BUCKETS={}):
+                start = time.perf_counter()
+                for _ in range(n):
+                    response = client.post(
+                        "/api/auth/login/", {"email": user.email, "password": password}, content_type="application/json"
+                    )
+                    assert response.status_code == 200, response.content
+            self.report("POST /api/auth/login/ (sequential)", n, time.perf_counter() - start)
+        finally:
+            OutstandingToken.objects.filter(user=user).delete()
+            user.delete()
+
+    async def run_pool(self, user, password, n, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def check():
+            async with semaphore:
+                assert await acheck_password(user, password)
+
+        await asyncio.gather(*(check() for _ in range(n)))
+
+    def report(self, label, n, elapsed):
+        self.stdout.write(f"{label:<48} {n / elapsed:10.1f} ops/sec  ({elapsed / n * 1000:.1f} ms/op)")
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired outstanding and blacklisted refresh tokens in small batches. "
+        "Unlike flushexpiredtokens, each batch is its own short transaction, so the "
+        "token tables are never locked for the duration of the whole purge."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Tokens deleted per transaction.")
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        cutoff = aware_utcnow()
+        expired = OutstandingToken.objects.filter(expires_at__lte=cutoff).order_by("id").values_list("id", flat=True)
+
+        total = 0
+        while True:
+            ids = list(expired[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                BlacklistedToken.objects.filter(token_id__in=ids).delete()
+                OutstandingToken.objects.filter(id__in=ids).delete()
+            total += len(ids)
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        self.stdout.write(f"Purged {total} expired token(s).")
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-17 19:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Users', '0002_user_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['updated_at'], name='users_updated_idx'),
+        ),
+    ]
@@ -38,10 +38,25 @@ class User(AbstractBaseUser, PermissionsMixin):
         ordering = ["-date_joined"]
         verbose_name = "User"
         verbose_name_plural = "Users"
+        indexes = [
+            # Default ordering and keyset pagination on (date_joined, id).
+            models.Index(fields=["date_joined", "id"], name="users_joined_idx"),
+            # Admin filters combined with the default ordering.
+            models.Index(fields=["is_active", "date_joined"], name="users_active_joined_idx"),
+            models.Index(fields=["is_staff", "date_joined"], name="users_staff_joined_idx"),
+            # max(updated_at) for conditional GET on users/.
+            models.Index(fields=["updated_at"], name="users_updated_idx"),
+        ]
 
     def __str__(self):
         return self.email
 
+    async def acheck_password(self, raw_password):
+        # Hash in the bounded pool so async callers (e.g. aauthenticate) don't stall the event loop.
+        from .hashing import acheck_password
+
+        return await acheck_password(self, raw_password)
+
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}".strip() or self.email
\ No newline at end of file
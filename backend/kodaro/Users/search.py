@@ -0,0 +1,50 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+BOOLEAN_VALUES = {"true": True, "1": True, "false": False, "0": False}
+
+
+def filter_users(queryset, query_params):
+    """
+    Apply the user listing filters to `queryset`, each answered from an index on Users.User:
+
+    - `?is_active=` / `?is_staff=`          true | false
+    - `?email=`                             email prefix
+    - `?joined_after=` / `?joined_before=`  ISO date or datetime bounds on date_joined
+    """
+    for name in ("is_active", "is_staff"):
+        raw = query_params.get(name)
+        if raw is not None:
+            if raw.lower() not in BOOLEAN_VALUES:
+                raise ValidationError({name: "Must be true or false."})
+            queryset = queryset.filter(**{name: BOOLEAN_VALUES[raw.lower()]})
+
+    email = query_params.get("email")
+    if email:
+        queryset = filter_email_prefix(queryset, email)
+
+    for name, lookup in (("joined_after", "date_joined__gte"), ("joined_before", "date_joined__lt")):
+        raw = query_params.get(name)
+        if raw:
+            queryset = queryset.filter(**{lookup: parse_bound(name, raw)})
+    return queryset
+
+
+def filter_email_prefix(queryset, prefix):
+    # The range lets the unique email index serve the lookup; startswith keeps exact semantics.
+    return queryset.filter(email__gte=prefix, email__lt=prefix + "\U0010ffff", email__startswith=prefix)
+
+
+def parse_bound(name, raw):
+    value = parse_datetime(raw)
+    if value is None:
+        day = parse_date(raw)
+        if day is None:
+            raise ValidationError({name: "Must be an ISO 8601 date or datetime."})
+        value = datetime.combine(day, time.min)
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
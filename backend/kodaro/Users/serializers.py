@@ -1,7 +1,12 @@
 from django.contrib.auth import get_user_model
+from django.conf import settings
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+
+from api.serializers import ValuesSerializerMixin
+from .activity import last_login_recorder
+from .tokens import CachedRefreshToken
 
 User = get_user_model()
 
@@ -19,10 +24,17 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     def validate(self, attrs):
         data = super().validate(attrs)
         data["user"] = UserSerializer(self.user).data
+        # Replaces UPDATE_LAST_LOGIN, which writes the row on every login.
+        last_login_recorder.record(self.user.pk)
         return data
 
 
-class UserSerializer(serializers.ModelSerializer):
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+    """Token refresh that checks and records the blacklist through the token blacklist cache."""
+    token_class = CachedRefreshToken
+
+
+class UserSerializer(ValuesSerializerMixin, serializers.ModelSerializer):
     full_name = serializers.ReadOnlyField()
 
     class Meta:
@@ -30,6 +42,14 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ["id", "email", "first_name", "last_name", "full_name", "is_active", "is_staff", "date_joined"]
         read_only_fields = ["id", "is_active", "is_staff", "date_joined"]
 
+    values_requires = {"full_name": ["first_name", "last_name", "email"]}
+
+    @classmethod
+    def complete_row(cls, row):
+        # Mirrors User.full_name.
+        row["full_name"] = f"{row['first_name']} {row['last_name']}".strip() or row["email"]
+        return row
+
 
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
@@ -69,4 +89,11 @@ class ChangePasswordSerializer(serializers.Serializer):
         user = self.context["request"].user
         user.set_password(self.validated_data["new_password"])
         user.save()
-        return user
\ No newline at end of file
+        return user
+
+
+class UserBulkActionSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=["activate", "deactivate", "grant_staff", "revoke_staff", "delete"])
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), allow_empty=False, max_length=settings.USERS_BULK_MAX_IDS
+    )
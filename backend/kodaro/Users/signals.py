@@ -0,0 +1,21 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import user_profile_cache
+from .serializers import UserSerializer
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+def invalidate_profile_on_save(sender, instance, update_fields=None, **kwargs):
+    # Saves limited to fields the profile doesn't show (e.g. last_login) keep the entry.
+    if update_fields is not None and not set(update_fields) & set(UserSerializer.Meta.fields):
+        return
+    user_profile_cache.invalidate([instance.pk])
+
+
+@receiver(post_delete, sender=User)
+def invalidate_profile_on_delete(sender, instance, **kwargs):
+    user_profile_cache.invalidate([instance.pk])
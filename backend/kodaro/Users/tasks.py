@@ -0,0 +1,42 @@
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import send_mail
+
+from taskqueue.queue import task
+
+User = get_user_model()
+
+audit_logger = logging.getLogger("kodaro.audit")
+
+
+@task
+def send_welcome_email(user_id):
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return
+    send_mail(
+        subject="Welcome to Kodaro",
+        message=f"Hi {user.full_name}, your account is ready.",
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[user.email],
+    )
+
+
+@task
+def send_password_changed_email(user_id):
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return
+    send_mail(
+        subject="Your Kodaro password was changed",
+        message="If this wasn't you, reset your password and contact support.",
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[user.email],
+    )
+
+
+@task
+def record_audit_event(event, user_id, **details):
+    audit_logger.info("%s user=%s %s", event, user_id, details)
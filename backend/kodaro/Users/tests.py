@@ -1,3 +1,372 @@
-from django.test import TestCase
+import csv
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher, ScryptPasswordHasher
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .activity import last_login_recorder
+from .authentication import user_status_cache
+from . import hashing
+from .blacklist import token_blacklist
+from .hashers import TunedArgon2PasswordHasher, TunedPBKDF2PasswordHasher, TunedScryptPasswordHasher
+from .cache import user_profile_cache
+from .serializers import UserSerializer
+from .tasks import record_audit_event
+from .tokens import CachedRefreshToken
+from .views import UserBatchView
+
+User = get_user_model()
+
+
+@override_settings(THROTTLE_BUCKETS={})
+class AuthenticationTests(TestCase):
+    def setUp(self):
+        user_status_cache.clear()
+        self.user = User.objects.create_user("user@example.com", "pw-Unused-123")
+        self.admin = User.objects.create_superuser("admin@example.com", "pw-Unused-123")
+
+    def get(self, path, user):
+        return self.client.get(path, HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+    def refresh(self, token):
+        return self.client.post("/api/auth/token/refresh/", {"refresh": str(token)}, content_type="application/json")
+
+    def test_inactive_user_is_rejected(self):
+        self.assertEqual(self.get("/api/users/me/", self.user).status_code, 200)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        user_status_cache.invalidate(self.user.pk)
+        self.assertEqual(self.get("/api/users/me/", self.user).status_code, 401)
+
+    def test_demoted_staff_loses_admin_access(self):
+        self.assertEqual(self.get("/api/users/", self.admin).status_code, 200)
+        User.objects.filter(pk=self.admin.pk).update(is_staff=False)
+        # Cached status flags keep the old role until they expire or are invalidated.
+        self.assertEqual(self.get("/api/users/", self.admin).status_code, 200)
+        user_status_cache.invalidate(self.admin.pk)
+        self.assertEqual(self.get("/api/users/", self.admin).status_code, 403)
+
+    def test_bulk_deactivate_takes_effect_at_once(self):
+        self.assertEqual(self.get("/api/users/me/", self.user).status_code, 200)
+        response = self.client.post(
+            "/api/users/bulk/", {"action": "deactivate", "ids": [str(self.user.pk)]}, content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.admin)}",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get("/api/users/me/", self.user).status_code, 401)
+
+    def test_detail_patch_cannot_change_status_flags(self):
+        response = self.client.patch(
+            f"/api/users/{self.user.pk}/", {"is_active": False, "first_name": "Renamed"},
+            content_type="application/json", HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.admin)}",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.first_name, self.user.is_active), ("Renamed", True))
+
+    def test_blacklisted_refresh_token_is_rejected_on_a_cache_miss(self):
+        token = CachedRefreshToken.for_user(self.user)
+        token.blacklist()
+        caches[settings.JWT_BLACKLIST_CACHE_ALIAS].clear()
+        self.assertEqual(self.refresh(token).status_code, 401)
+
+    def test_bulk_deactivate_blacklists_refresh_tokens(self):
+        token = CachedRefreshToken.for_user(self.user)
+        response = self.client.post(
+            "/api/users/bulk/", {"action": "deactivate", "ids": [str(self.user.pk)]}, content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.admin)}",
+        )
+        self.assertEqual(response.json(), {"action": "deactivate", "matched": 1, "tokens_blacklisted": 1})
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=token["jti"]).exists())
+        caches[settings.JWT_BLACKLIST_CACHE_ALIAS].clear()
+        self.assertEqual(self.refresh(token).status_code, 401)
+
+
+@override_settings(JWT_BLACKLIST_BLOOM=True)
+class TokenBlacklistTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("user@example.com", "pw-Unused-123")
+        token_blacklist.cache.clear()
+        token_blacklist._bloom = None
+        self.addCleanup(setattr, token_blacklist, "_bloom", None)
+
+    def blacklisted_token(self):
+        token = CachedRefreshToken.for_user(self.user)
+        token.blacklist()
+        return token
+
+    def test_cold_cache_falls_back_to_the_database(self):
+        token = self.blacklisted_token()
+        token_blacklist.cache.clear()
+        token_blacklist._bloom = None
+        with self.assertRaises(TokenError):
+            CachedRefreshToken(str(token))
+        # The positive found in the database is cached for the next check.
+        with self.assertNumQueries(0):
+            self.assertTrue(token_blacklist.contains(token["jti"], token["exp"]))
+
+    def test_unlisted_token_is_accepted_without_a_query(self):
+        self.blacklisted_token()
+        token = CachedRefreshToken.for_user(self.user)
+        token_blacklist.get_bloom()
+        with self.assertNumQueries(0):
+            self.assertFalse(token_blacklist.contains(token["jti"], token["exp"]))
+            CachedRefreshToken(str(token))
+
+    def test_purge_keeps_live_entries_in_the_rebuilt_filter(self):
+        live, expired = self.blacklisted_token(), self.blacklisted_token()
+        OutstandingToken.objects.filter(jti=expired["jti"]).update(expires_at=timezone.now() - timedelta(days=1))
+        call_command("purge_tokens", stdout=mock.Mock())
+
+        self.assertFalse(OutstandingToken.objects.filter(jti=expired["jti"]).exists())
+        token_blacklist.cache.clear()
+        token_blacklist._bloom = None
+        self.assertIn(live["jti"], token_blacklist.get_bloom())
+        with self.assertRaises(TokenError):
+            CachedRefreshToken(str(live))
+
+
+class AsyncUserListTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser("admin@example.com", "pw-Unused-123")
+        joined = timezone.now() - timedelta(days=1)
+        for i in range(5):
+            # Two users per timestamp, so pages have to break ties on id.
+            user = User.objects.create_user(f"user{i}@example.com", "pw-Unused-123", is_active=i != 4)
+            User.objects.filter(pk=user.pk).update(date_joined=joined - timedelta(hours=i // 2))
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(self.admin)}"}
+
+    async def test_keyset_pages_follow_filters(self):
+        emails, url = [], "/api/async/users/?page_size=2&is_active=true&email=user&count=exact"
+        while url:
+            response = await self.async_client.get(url, headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertEqual(data["count"], 4)
+            self.assertLessEqual(len(data["results"]), 2)
+            emails += [row["email"] for row in data["results"]]
+            url = data["next"]
+        expected = User.objects.filter(is_active=True, email__startswith="user").order_by("-date_joined", "-id")
+        self.assertEqual(emails, [user.email async for user in expected])
+
+
+class LastLoginRecorderTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("user@example.com", "pw-Unused-123")
+
+    @override_settings(THROTTLE_BUCKETS={})
+    def test_login_writes_last_login_inline_under_tests(self):
+        response = self.client.post(
+            "/api/auth/login/", {"email": "user@example.com", "password": "pw-Unused-123"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(User.objects.get(pk=self.user.pk).last_login)
+
+    @override_settings(USERS_LAST_LOGIN_FLUSH_INTERVAL=3600)
+    def test_flush_leaves_updated_at_alone(self):
+        updated_at = self.user.updated_at
+        when = timezone.now() + timedelta(minutes=1)
+        last_login_recorder.record(self.user.pk, when)
+        self.assertIsNone(User.objects.get(pk=self.user.pk).last_login)
+        self.assertEqual(last_login_recorder.flush(), 1)
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual((user.last_login, user.updated_at), (when, updated_at))
+
+
+class ProfileCacheTests(TestCase):
+    def setUp(self):
+        user_status_cache.clear()
+        user_profile_cache.cache.clear()
+        self.user = User.objects.create_user("user@example.com", "pw-Unused-123", first_name="Old")
+        self.admin = User.objects.create_superuser("admin@example.com", "pw-Unused-123")
+
+    def request(self, method, path, user, **kwargs):
+        auth = f"Bearer {AccessToken.for_user(user)}"
+        return getattr(self.client, method)(path, HTTP_AUTHORIZATION=auth, content_type="application/json", **kwargs)
+
+    def test_hit_needs_no_query(self):
+        first = self.request("get", "/api/users/me/", self.user)
+        user_status_cache.get(self.user.pk)
+        with self.assertNumQueries(0):
+            second = self.request("get", "/api/users/me/", self.user)
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(first["ETag"], second["ETag"])
+
+    def test_patch_invalidates(self):
+        self.assertEqual(self.request("get", "/api/users/me/", self.user).json()["first_name"], "Old")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.request("patch", "/api/users/me/", self.user, data={"first_name": "New"})
+        self.assertEqual(self.request("get", "/api/users/me/", self.user).json()["first_name"], "New")
+
+    def test_deactivation_invalidates(self):
+        path = f"/api/users/{self.user.pk}/"
+        self.assertTrue(self.request("get", path, self.admin).json()["is_active"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.request("post", "/api/users/bulk/", self.admin, data={"action": "deactivate", "ids": [str(self.user.pk)]})
+        self.assertFalse(self.request("get", path, self.admin).json()["is_active"])
+
+
+class LogoutTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("user@example.com", "pw-Unused-123")
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(self.user)}"}
+
+    def logout(self, refresh):
+        return self.client.post("/api/auth/logout/", {"refresh": refresh}, content_type="application/json", **self.auth)
+
+    def test_logout_blacklists_the_token(self):
+        token = CachedRefreshToken.for_user(self.user)
+        self.assertEqual(self.logout(str(token)).status_code, 200)
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=token["jti"]).exists())
+
+    def test_invalid_token_is_a_bad_request(self):
+        self.assertEqual(self.logout("not-a-token").status_code, 400)
+
+    def test_audit_failure_is_not_reported_as_a_token_error(self):
+        token = CachedRefreshToken.for_user(self.user)
+        with mock.patch.object(record_audit_event, "enqueue", side_effect=RuntimeError("queue down")):
+            with self.assertRaises(RuntimeError):
+                self.logout(str(token))
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser("admin@example.com", "pw-Unused-123")
+        self.user = User.objects.create_user("user@example.com", "pw-Unused-123", first_name="Ada")
+
+    def export(self, **kwargs):
+        response = self.client.get(
+            "/api/users/export/", HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.admin)}", **kwargs
+        )
+        self.assertEqual(response.status_code, 200)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_ndjson_is_the_default(self):
+        response, body = self.export()
+        self.assertTrue(response["Content-Type"].startswith("application/x-ndjson"))
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="users.ndjson"')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row["email"] for row in rows], ["admin@example.com", "user@example.com"])
+        self.assertEqual(rows[1]["id"], str(self.user.pk))
+        self.assertEqual(rows[1]["full_name"], "Ada")
+        self.assertEqual(rows[1]["date_joined"], self.user.date_joined.isoformat().replace("+00:00", "Z"))
+
+    def test_csv_has_a_header_and_json_formatted_cells(self):
+        response, body = self.export(data={"format": "csv"})
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        header, *rows = csv.reader(body.splitlines())
+        self.assertEqual(header, UserSerializer.values_fields())
+        row = dict(zip(header, rows[1]))
+        self.assertEqual(row["id"], str(self.user.pk))
+        self.assertEqual(row["date_joined"], self.user.date_joined.isoformat().replace("+00:00", "Z"))
+        self.assertEqual(row["is_staff"], "False")
+
+    def test_negotiation_by_accept_or_format(self):
+        response, _ = self.export(HTTP_ACCEPT="text/csv")
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        response, _ = self.export(data={"format": "csv"}, HTTP_ACCEPT="application/x-ndjson, */*;q=0.1")
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        response = self.client.get(
+            "/api/users/export/", {"format": "ndjson"}, HTTP_ACCEPT="text/csv",
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.admin)}",
+        )
+        self.assertEqual(response.status_code, 406)
+
+
+class UserBatchTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser("admin@example.com", "pw-Unused-123")
+        self.users = [User.objects.create_user(f"user{n}@example.com", "pw-Unused-123") for n in range(3)]
+
+    def post(self, ids):
+        return self.client.post(
+            "/api/users/batch/", {"ids": ids}, content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.admin)}",
+        )
+
+    def test_results_follow_request_order(self):
+        wanted = [str(user.pk) for user in reversed(self.users)]
+        response = self.post(wanted)
+        self.assertEqual([row["id"] for row in response.json()["results"]], wanted)
+        self.assertEqual(response.json()["missing"], [])
+
+    def test_missing_and_duplicate_ids(self):
+        first, gone = str(self.users[0].pk), str(uuid.uuid4())
+        response = self.post([gone, first, first.upper(), gone])
+        self.assertEqual([row["id"] for row in response.json()["results"]], [first])
+        self.assertEqual(response.json()["missing"], [gone])
+
+    def test_id_list_limits(self):
+        with mock.patch.object(UserBatchView, "max_ids", 2):
+            response = self.post([str(user.pk) for user in self.users])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("ids", response.json())
+        self.assertEqual(self.post([]).status_code, 400)
+        self.assertEqual(self.post(["not-a-uuid"]).status_code, 400)
+
+
+try:
+    import argon2
+except ImportError:
+    argon2 = None
+
+
+class TunedHasherTests(TestCase):
+    # Low costs keep the tests fast; what matters is tuned vs stock, not the values.
+    def check_upgrade(self, name, stock_class, tuned_class, cost, raised):
+        stock = stock_class()
+        for param, value in cost.items():
+            setattr(stock, param, value)
+        encoded = stock.encode("pw-Unused-123", stock.salt())
+
+        with override_settings(PASSWORD_HASHING_COST={name: cost}):
+            tuned = tuned_class()
+            self.assertEqual(tuned.algorithm, stock.algorithm)
+            self.assertTrue(tuned.verify("pw-Unused-123", encoded))
+            self.assertFalse(tuned.verify("wrong", encoded))
+            self.assertFalse(tuned.must_update(encoded))
+        with override_settings(PASSWORD_HASHING_COST={name: {**cost, **raised}}):
+            self.assertTrue(tuned_class().must_update(encoded))
+
+    def test_pbkdf2(self):
+        self.check_upgrade(
+            "pbkdf2", PBKDF2PasswordHasher, TunedPBKDF2PasswordHasher, {"iterations": 1000}, {"iterations": 2000}
+        )
+
+    def test_scrypt(self):
+        cost = {"work_factor": 2 ** 4, "block_size": 8, "parallelism": 1}
+        self.check_upgrade("scrypt", ScryptPasswordHasher, TunedScryptPasswordHasher, cost, {"work_factor": 2 ** 5})
+
+    @skipUnless(argon2, "argon2-cffi is not installed")
+    def test_argon2(self):
+        cost = {"time_cost": 1, "memory_cost": 8, "parallelism": 1}
+        self.check_upgrade("argon2", Argon2PasswordHasher, TunedArgon2PasswordHasher, cost, {"time_cost": 2})
+
+    @override_settings(PASSWORD_HASHING_COST={"pbkdf2": {"iterations": 2000}})
+    def test_login_rehashes_to_the_tuned_cost(self):
+        user = User.objects.create_user("user@example.com")
+        user.password = PBKDF2PasswordHasher().encode("pw-Unused-123", "somesalt", iterations=1000)
+        user.save(update_fields=["password"])
+        self.assertTrue(user.check_password("pw-Unused-123"))
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$2000$"))
+
+    def test_executor_is_created_once(self):
+        self.addCleanup(setattr, hashing, "_executor", hashing._executor)
+        hashing._executor = None
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            executors = set(pool.map(lambda _: hashing.get_executor(), range(32)))
+        self.assertEqual(len(executors), 1)
+        executors.pop().shutdown()
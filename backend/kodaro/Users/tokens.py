@@ -0,0 +1,19 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .blacklist import token_blacklist
+
+
+class CachedRefreshToken(RefreshToken):
+    """RefreshToken whose blacklist checks go through Users.blacklist.token_blacklist."""
+
+    def check_blacklist(self):
+        if token_blacklist.contains(self.payload[api_settings.JTI_CLAIM], self.payload["exp"]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        result = super().blacklist()
+        token_blacklist.add(self.payload[api_settings.JTI_CLAIM], self.payload["exp"])
+        return result
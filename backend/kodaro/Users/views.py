@@ -1,15 +1,32 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from rest_framework import generics, status
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from rest_framework import generics, serializers, status
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView as BaseTokenRefreshView
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from api.batch import BatchView
+from api.exports import ExportView
+from api.pagination import UserCursorPagination
+from api.throttling import EmailBucketThrottle, IPBucketThrottle
+from .authentication import StatelessJWTAuthentication
+from .bulk import apply_bulk_action
+from .cache import user_profile_cache, users_list_etag
+from .search import filter_users
+from .tasks import record_audit_event, send_password_changed_email, send_welcome_email
+from .tokens import CachedRefreshToken
+
 from .serializers import (
     ChangePasswordSerializer,
     CustomTokenObtainPairSerializer,
     RegisterSerializer,
+    UserBulkActionSerializer,
     UserSerializer,
 )
 
@@ -20,23 +37,32 @@ class LoginView(TokenObtainPairView):
     """
     POST /auth/login/
     Returns access + refresh JWT tokens along with user data.
+    Rate-limited per client address and per submitted email.
     """
     serializer_class = CustomTokenObtainPairSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [IPBucketThrottle, EmailBucketThrottle]
+    throttle_scope = "login"
 
 
 class RegisterView(generics.CreateAPIView):
     """
     POST /auth/register/
-    Creates a new user account.
+    Creates a new user account. Rate-limited per client address.
+    The welcome email and audit entry are queued for the task worker.
     """
     serializer_class = RegisterSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [IPBucketThrottle]
+    throttle_scope = "register"
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+        with transaction.atomic():
+            user = serializer.save()
+            send_welcome_email.enqueue(user_id=user.pk, idempotency_key=f"welcome-email:{user.pk}")
+            record_audit_event.enqueue(event="user.registered", user_id=user.pk)
 
         # Issue tokens immediately on registration
         refresh = RefreshToken.for_user(user)
@@ -50,6 +76,16 @@ class RegisterView(generics.CreateAPIView):
         )
 
 
+class TokenRefreshView(BaseTokenRefreshView):
+    """
+    POST /auth/token/refresh/
+    Exchanges a refresh token for a new access (and rotated refresh) token.
+    Rate-limited per client address.
+    """
+    throttle_classes = [IPBucketThrottle]
+    throttle_scope = "token-refresh"
+
+
 class LogoutView(APIView):
     """
     POST /auth/logout/
@@ -59,23 +95,48 @@ class LogoutView(APIView):
 
     def post(self, request):
         try:
-            refresh_token = request.data["refresh"]
-            token = RefreshToken(refresh_token)
+            token = CachedRefreshToken(request.data["refresh"])
             token.blacklist()
-            return Response({"detail": "Successfully logged out."}, status=status.HTTP_200_OK)
-        except Exception:
+        except (KeyError, TokenError):
             return Response({"detail": "Invalid or expired token."}, status=status.HTTP_400_BAD_REQUEST)
+        # Outside the try: a queueing failure is a server error, not a bad token.
+        record_audit_event.enqueue(
+            event="user.logout", user_id=request.user.pk, idempotency_key=f"logout:{token['jti']}"
+        )
+        return Response({"detail": "Successfully logged out."}, status=status.HTTP_200_OK)
+
+
+class CachedProfileMixin:
+    """
+    Serves GET from user_profile_cache: a hit costs no query and no serializer run,
+    and If-None-Match with the profile's ETag gets a 304.
+    """
 
+    def retrieve(self, request, *args, **kwargs):
+        user_id = self.get_profile_id()
+        entry = user_profile_cache.get(user_id)
+        if entry is None:
+            entry = user_profile_cache.set(get_object_or_404(User, pk=user_id))
+        etag, data = entry
+        response = get_conditional_response(request, etag=etag) or Response(data)
+        response["ETag"] = etag
+        return response
 
-class MeView(generics.RetrieveUpdateAPIView):
+
+class MeView(CachedProfileMixin, generics.RetrieveUpdateAPIView):
     """
-    GET  /users/me/   → Return the authenticated user's profile.
+    GET  /users/me/   → Return the authenticated user's profile (cached per user).
     PATCH/PUT         → Update the authenticated user's profile.
     """
     serializer_class = UserSerializer
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
+    def get_profile_id(self):
+        return self.request.user.id
+
     def get_object(self):
+        # Unsafe methods authenticate with the full User row.
         return self.request.user
 
 
@@ -83,6 +144,7 @@ class ChangePasswordView(generics.UpdateAPIView):
     """
     PUT /users/me/change-password/
     Allows the authenticated user to change their password.
+    The notification email and audit entry are queued for the task worker.
     """
     serializer_class = ChangePasswordSerializer
     permission_classes = [IsAuthenticated]
@@ -93,7 +155,10 @@ class ChangePasswordView(generics.UpdateAPIView):
     def update(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        with transaction.atomic():
+            user = serializer.save()
+            send_password_changed_email.enqueue(user_id=user.pk)
+            record_audit_event.enqueue(event="user.password_changed", user_id=user.pk)
         return Response({"detail": "Password updated successfully."}, status=status.HTTP_200_OK)
 
 
@@ -101,19 +166,94 @@ class ChangePasswordView(generics.UpdateAPIView):
 
 class UserListView(generics.ListAPIView):
     """
-    GET /users/   → List all users (admin only).
+    GET /users/   → List users, newest first, keyset-paginated on (date_joined, id) (admin only).
+                    Filters: ?is_active=, ?is_staff=, ?email=<prefix>, ?joined_after=, ?joined_before=.
+                    ?count=exact|estimate adds a total.
+                    Rows are read with `.values()` and returned as plain dicts.
+                    The ETag follows max(updated_at) and the users change counter,
+                    so unchanged listings answer If-None-Match with 304.
     """
     serializer_class = UserSerializer
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAdminUser]
+    pagination_class = UserCursorPagination
     queryset = User.objects.all()
 
+    def get_queryset(self):
+        return filter_users(super().get_queryset(), self.request.query_params)
+
+    def get(self, request, *args, **kwargs):
+        etag = users_list_etag(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        response["ETag"] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        rows = UserSerializer.values_queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        return self.get_paginated_response(list(UserSerializer.values_rows(page)))
+
 
-class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
+class UserDetailView(CachedProfileMixin, generics.RetrieveUpdateDestroyAPIView):
     """
-    GET    /users/<id>/   → Retrieve a user (admin only).
-    PATCH  /users/<id>/   → Update a user (admin only).
+    GET    /users/<id>/   → Retrieve a user (admin only, cached per user).
+    PATCH  /users/<id>/   → Update a user's profile fields (admin only); status flags change
+                            through users/bulk/, which also revokes tokens and cached status.
     DELETE /users/<id>/   → Delete a user (admin only).
     """
     serializer_class = UserSerializer
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAdminUser]
+    queryset = User.objects.all()
+
+    def get_profile_id(self):
+        return self.kwargs["pk"]
+
+    def perform_destroy(self, instance):
+        # Same path as bulk deletes: blacklists refresh tokens and invalidates cached state.
+        apply_bulk_action("delete", [instance.pk])
+
+
+class UserBulkView(APIView):
+    """
+    POST /users/bulk/   → Apply one action to many users (admin only).
+                          Body: {"action": "activate|deactivate|grant_staff|revoke_staff|delete", "ids": [...]}.
+                          Runs as chunked UPDATE / DELETE statements; deactivate and delete also
+                          blacklist the users' outstanding refresh tokens. The caller's own account
+                          is never changed.
+    """
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        serializer = UserBulkActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        action = serializer.validated_data["action"]
+        ids = {user_id for user_id in serializer.validated_data["ids"] if user_id != request.user.pk}
+        matched, blacklisted = apply_bulk_action(action, ids)
+        return Response({"action": action, "matched": matched, "tokens_blacklisted": blacklisted})
+
+
+class UserBatchView(BatchView):
+    """
+    GET  /users/batch/?ids=<uuid>,<uuid>   → Fetch many users by id in one round trip (admin only).
+    POST /users/batch/                     → Same, with the ids in the body: {"ids": [...]}.
+                                             Returns {"results": [...], "missing": [...]}; up to USERS_BATCH_MAX_IDS ids.
+    """
+    permission_classes = [IsAdminUser]
+    serializer_class = UserSerializer
+    queryset = User.objects.all()
+    id_field_class = serializers.UUIDField
+    max_ids = settings.USERS_BATCH_MAX_IDS
+
+
+class UserExportView(ExportView):
+    """
+    GET /users/export/   → Stream all users as NDJSON (default) or CSV (`?format=csv`) (admin only).
+    """
+    serializer_class = UserSerializer
     permission_classes = [IsAdminUser]
-    queryset = User.objects.all()
\ No newline at end of file
+    queryset = User.objects.order_by("date_joined", "id")
+    filename = "users"
@@ -3,3 +3,17 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = 'api'
+    # The type 0001_initial created api_item.id with. Letting it follow the project
+    # default would queue an AlterField that SQLite applies by remaking api_item,
+    # dropping the FTS5 sync triggers from 0002_item_search.
+    default_auto_field = 'django.db.models.BigAutoField'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from . import signals  # noqa: F401
+        from .instrumentation import install_query_recorder
+        from .routers import install_in_flight_counter
+
+        connection_created.connect(install_query_recorder)
+        connection_created.connect(install_in_flight_counter)
@@ -0,0 +1,142 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework.exceptions import APIException, ValidationError
+
+from Users.authentication import StatelessJWTAuthentication
+from .changes import ChangesExpired, changes_since, feed_hub, head_seq, parse_seq
+from .models import Item
+from .renderers import dumps
+from .search import search_items
+from .serializers import ItemSerializer, parse_fields
+
+
+class AsyncAPIView(View):
+    """
+    Minimal ASGI-native counterpart of DRF's APIView for read endpoints.
+    DRF views are synchronous, so under kodaro.asgi each request occupies a worker thread;
+    these views run on the event loop and only yield to it while waiting on the database.
+    Authentication goes through StatelessJWTAuthentication.aauthenticate, so no User row is loaded.
+    """
+    admin_only = False
+    authentication_class = StatelessJWTAuthentication
+
+    async def dispatch(self, request, *args, **kwargs):
+        authenticator = self.authentication_class()
+        try:
+            result = await authenticator.aauthenticate(request)
+            if result is None:
+                return self.error(
+                    {"detail": "Authentication credentials were not provided."},
+                    status=401,
+                    headers={"WWW-Authenticate": authenticator.authenticate_header(request)},
+                )
+            request.user, request.auth = result
+            if self.admin_only and not request.user.is_staff:
+                return self.error({"detail": "You do not have permission to perform this action."}, status=403)
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            headers = {}
+            if exc.status_code == 401:
+                headers["WWW-Authenticate"] = authenticator.authenticate_header(request)
+            return self.error(exc.detail, status=exc.status_code, headers=headers)
+
+    def respond(self, data, status=200, headers=None):
+        return HttpResponse(dumps(data), status=status, content_type="application/json", headers=headers)
+
+    def error(self, detail, status, headers=None):
+        if not isinstance(detail, (dict, list)):
+            detail = {"detail": detail}
+        return self.respond(detail, status=status, headers=headers)
+
+
+class AsyncItemsView(AsyncAPIView):
+    """
+    GET /async/items/   → Keyset-paginated item list served on the event loop.
+                          `?after=<id>` continues after the last id of the previous page,
+                          `?page_size=`, `?fields=` and the search parameters behave as on items/.
+    """
+
+    async def get(self, request):
+        fields = parse_fields(request.GET, ItemSerializer)
+        page_size = self.get_page_size(request)
+        items = search_items(Item.objects.order_by("id"), request.GET)
+        if request.GET.get("after"):
+            try:
+                items = items.filter(id__gt=int(request.GET["after"]))
+            except ValueError:
+                raise ValidationError({"after": "A valid integer is required."})
+
+        rows = ItemSerializer.values_queryset(items[:page_size + 1], fields)
+        results = [row async for row in rows.aiterator()]
+        has_next = len(results) > page_size
+        results = results[:page_size]
+
+        next_url = None
+        if has_next:
+            query = request.GET.copy()
+            query["after"] = results[-1]["id"]
+            next_url = request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+        return self.respond({"next": next_url, "results": results})
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.GET.get("page_size", settings.ITEMS_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError({"page_size": "A valid integer is required."})
+        return max(1, min(page_size, settings.ITEMS_MAX_PAGE_SIZE))
+
+
+class AsyncItemChangesStreamView(AsyncAPIView):
+    """
+    GET /async/items/changes/stream/   → Server-sent events for item changes (ASGI only).
+                                         Each `changes` event carries the items/changes/ payload
+                                         and uses its `seq` as the event id, so a reconnect with
+                                         Last-Event-ID (or `?since=`) resumes where it stopped.
+                                         Without a cursor the stream starts at the current head.
+                                         Idle streams only wait on feed_hub and get a comment
+                                         every ITEMS_FEED_HEARTBEAT seconds; they run no queries.
+    """
+
+    async def get(self, request):
+        since = parse_seq(request.headers.get("Last-Event-ID"), "Last-Event-ID")
+        if since is None:
+            since = parse_seq(request.GET.get("since"))
+        fields = parse_fields(request.GET, ItemSerializer)
+        if since is None:
+            since, pending = await sync_to_async(head_seq)(), None
+        else:
+            # Read the first delta up front so an expired cursor gets a 410 instead of a stream.
+            pending = await sync_to_async(changes_since)(since, None, fields)
+
+        response = StreamingHttpResponse(self.events(since, fields, pending), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def events(self, cursor, fields, pending):
+        with feed_hub.subscription():
+            yield f"retry: {settings.ITEMS_FEED_RETRY_MS}\n\n".encode()
+            while True:
+                if pending is None:
+                    if await feed_hub.wait(cursor, settings.ITEMS_FEED_HEARTBEAT) is None:
+                        yield b": keep-alive\n\n"
+                        continue
+                    try:
+                        pending = await sync_to_async(changes_since)(cursor, None, fields)
+                    except ChangesExpired as exc:
+                        yield b"event: expired\ndata: " + dumps({"detail": exc.detail}) + b"\n\n"
+                        return
+
+                if pending["seq"] > cursor:
+                    cursor = pending["seq"]
+                    yield f"id: {cursor}\nevent: changes\ndata: ".encode() + dumps(pending) + b"\n\n"
+                    more = pending["has_more"]
+                    pending = await sync_to_async(changes_since)(cursor, None, fields) if more else None
+                else:
+                    # The replica this read went to is behind the head the poller saw.
+                    pending = None
+                    await asyncio.sleep(settings.ITEMS_FEED_POLL_INTERVAL)
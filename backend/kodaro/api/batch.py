@@ -0,0 +1,55 @@
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from Users.authentication import StatelessJWTAuthentication
+from .instrumentation import timed
+from .serializers import parse_fields
+
+
+class BatchView(APIView):
+    """
+    Base view for multi-get endpoints.
+    Ids come from `?ids=a,b,c` (GET) or a `{"ids": [...]}` body (POST, for long lists) and are
+    resolved with one `WHERE id IN (…)` query per BATCH_LOOKUP_CHUNK_SIZE ids through the
+    serializer's `.values()` path. `results` follows the request order (duplicates collapsed),
+    `missing` lists the ids that matched nothing; `?fields=` projects the rows.
+    """
+    authentication_classes = [StatelessJWTAuthentication]
+    serializer_class = None
+    queryset = None
+    id_field_class = serializers.IntegerField
+    max_ids = None
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+    def get(self, request):
+        raw = request.query_params.get("ids", "")
+        return self.lookup(request, [value.strip() for value in raw.split(",") if value.strip()])
+
+    def post(self, request):
+        return self.lookup(request, request.data.get("ids") if isinstance(request.data, dict) else None)
+
+    def lookup(self, request, raw_ids):
+        ids = list(dict.fromkeys(self.parse_ids(raw_ids)))
+        fields = parse_fields(request.query_params, self.serializer_class)
+        rows = {}
+        chunk_size = settings.BATCH_LOOKUP_CHUNK_SIZE
+        with timed("serialize"):
+            for start in range(0, len(ids), chunk_size):
+                # Rows are put back in request order, so the model's default ordering would be a wasted sort.
+                queryset = self.get_queryset().filter(pk__in=ids[start:start + chunk_size]).order_by()
+                rows.update((row["id"], row) for row in self.serializer_class.values_data(queryset, fields))
+        return Response({
+            "results": [rows[pk] for pk in ids if pk in rows],
+            "missing": [pk for pk in ids if pk not in rows],
+        })
+
+    def parse_ids(self, raw_ids):
+        field = serializers.ListField(child=self.id_field_class(), allow_empty=False, max_length=self.max_ids)
+        try:
+            return field.run_validation(raw_ids if raw_ids is not None else serializers.empty)
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError({"ids": exc.detail})
@@ -0,0 +1,82 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+class TableVersion:
+    """
+    Change counter for one table, stored in a Django cache so every worker sharing
+    that cache sees the same value. Cached data is keyed by the current version, so
+    bumping it makes all earlier entries unreachable without deleting them.
+
+    The counter is seeded from the clock rather than 1, so if the key is ever evicted
+    the new value can never collide with a version that was used before.
+    """
+
+    def __init__(self, name, alias=None):
+        self.key = f"version:{name}"
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias or settings.ITEMS_CACHE_ALIAS]
+
+    def get(self):
+        version = self.cache.get(self.key)
+        if version is None:
+            self.cache.add(self.key, time.time_ns(), timeout=None)
+            version = self.cache.get(self.key)
+        return version
+
+    def bump(self):
+        try:
+            self.cache.incr(self.key)
+        except ValueError:
+            self.cache.add(self.key, time.time_ns(), timeout=None)
+
+    def bump_on_commit(self):
+        """Bump once the current transaction commits (immediately outside a transaction),
+        so readers can't re-cache pre-commit data under the new version."""
+        transaction.on_commit(self.bump)
+
+
+class VersionedResponseCache:
+    """
+    Read-through cache of rendered response bodies, keyed by a TableVersion, the full
+    request URL (path + query string) and the negotiated media type, so each page/filter
+    combination is cached separately. Entries are `(etag, content_type, body_bytes)`;
+    a hit needs neither the ORM nor a serializer.
+
+    The ETag is a hash of the body, so a 304 is only ever sent for content that was
+    actually rendered; a worker with a stale version can at worst serve an entry until
+    it expires after ITEMS_CACHE_TIMEOUT.
+    """
+
+    def __init__(self, version, prefix, alias=None):
+        self.version = version
+        self.prefix = prefix
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias or settings.ITEMS_CACHE_ALIAS]
+
+    def key(self, request):
+        target = f"{request.build_absolute_uri()} {getattr(request, 'accepted_media_type', '')}"
+        digest = hashlib.sha1(target.encode()).hexdigest()
+        return f"{self.prefix}:{self.version.get()}:{digest}"
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, content_type, content):
+        entry = (f'"{hashlib.sha1(content).hexdigest()}"', content_type, content)
+        self.cache.set(key, entry, timeout=settings.ITEMS_CACHE_TIMEOUT)
+        return entry
+
+
+items_version = TableVersion("items")
+items_list_cache = VersionedResponseCache(items_version, prefix="items:list")
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import Item, ItemChange
+from .serializers import ItemSerializer
+
+logger = logging.getLogger("kodaro.changes")
+
+
+class ChangesExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "Changes since this sequence number were pruned; reload items and resume from the current seq."
+    default_code = "changes_expired"
+
+
+def record_changes(item_ids, op):
+    """
+    Append one ItemChange per id once the current transaction commits, so rolled-back
+    writes are never logged. This does not make `seq` follow commit order: on PostgreSQL
+    two concurrent inserts draw their seqs first and commit in either order, so an entry
+    can become visible just below a seq a reader has already passed. changes_since
+    re-reads the last ITEMS_CHANGES_REREAD seconds of the log to pick those up.
+    """
+    item_ids = list(item_ids)
+    if not item_ids:
+        return
+    transaction.on_commit(lambda: ItemChange.objects.bulk_create(
+        [ItemChange(item_id=item_id, op=op) for item_id in item_ids],
+        batch_size=settings.ITEMS_BULK_BATCH_SIZE,
+    ))
+
+
+def parse_seq(value, param="since"):
+    """Parse a sequence number from a query parameter or header; None when absent."""
+    if value in (None, ""):
+        return None
+    try:
+        seq = int(value)
+    except ValueError:
+        seq = -1
+    if seq < 0:
+        raise ValidationError({param: "A non-negative integer is required."})
+    return seq
+
+
+def head_seq(using=None):
+    return ItemChange.objects.using(using or router.db_for_read(ItemChange)).aggregate(head=Max("seq"))["head"] or 0
+
+
+def changes_since(since, limit=None, fields=None):
+    """
+    Collapse the log after `since` into the current state of each touched item.
+    Returns `{"seq", "has_more", "upserted", "deleted"}`: `upserted` holds the current rows
+    (projected to `fields`), `deleted` the ids that no longer exist, and `seq` is the cursor
+    to pass as `since` next time. All reads go to one database so rows match the log.
+
+    Entries at or below `since` written in the last ITEMS_CHANGES_REREAD seconds are
+    folded in again, so one that committed after a reader passed its seq (see
+    record_changes) is still delivered; re-sending current state is harmless.
+    """
+    limit = limit or settings.ITEMS_CHANGES_PAGE_SIZE
+    using = router.db_for_read(ItemChange)
+    changes = ItemChange.objects.using(using)
+    log = list(changes.filter(seq__gt=since).order_by("seq").values_list("seq", "item_id", "op")[:limit + 1])
+    has_more = len(log) > limit
+    log = log[:limit]
+    if not log or log[0][0] > since + 1:
+        oldest = changes.aggregate(oldest=Min("seq"))["oldest"]
+        if oldest is not None and oldest > since + 1:
+            raise ChangesExpired()
+    recent = []
+    if since and settings.ITEMS_CHANGES_REREAD:
+        recent = list(
+            changes.filter(seq__lte=since, changed_at__gte=timezone.now() - timedelta(seconds=settings.ITEMS_CHANGES_REREAD))
+            .order_by("-seq")
+            .values_list("seq", "item_id", "op")[:limit]
+        )[::-1]
+    if not log and not recent:
+        return {"seq": since, "has_more": False, "upserted": [], "deleted": []}
+
+    # Only the last entry per item matters; keep items in the order of their last change.
+    latest = {}
+    for _, item_id, op in recent + log:
+        latest.pop(item_id, None)
+        latest[item_id] = op
+    upserted_ids = [item_id for item_id, op in latest.items() if op == ItemChange.Op.UPSERT]
+    rows = {
+        row["id"]: row
+        for row in ItemSerializer.values_data(Item.objects.using(using).filter(id__in=upserted_ids), fields)
+    }
+    return {
+        "seq": log[-1][0] if log else since,
+        "has_more": has_more,
+        "upserted": [rows[item_id] for item_id in upserted_ids if item_id in rows],
+        # An upsert whose row is gone was deleted by a change past this page.
+        "deleted": [item_id for item_id in latest if item_id not in rows],
+    }
+
+
+def prune_changes(older_than, batch_size=1000):
+    """
+    Delete log entries written before `older_than`, in short batches. The newest entry
+    is always kept, so a cursor older than everything retained is detected as expired.
+    """
+    expired = ItemChange.objects.filter(changed_at__lt=older_than, seq__lt=head_seq(using=router.db_for_write(ItemChange)))
+    total = 0
+    while seqs := list(expired.values_list("seq", flat=True)[:batch_size]):
+        total += ItemChange.objects.filter(seq__in=seqs).delete()[0]
+    return total
+
+
+class ChangeFeedHub:
+    """
+    Wakes streaming clients when the change log grows.
+    One poller per event loop reads the head seq every ITEMS_FEED_POLL_INTERVAL seconds,
+    only while at least one stream is subscribed, so the database sees one cheap query per
+    interval per worker however many clients are connected, and none when all are idle.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._condition = None
+        self._poller = None
+        self._subscribers = 0
+        self.head = None
+
+    @contextmanager
+    def subscription(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop, self._condition, self._poller, self._subscribers = loop, asyncio.Condition(), None, 0
+        self._subscribers += 1
+        self._ensure_poller()
+        try:
+            yield self
+        finally:
+            self._subscribers -= 1
+
+    async def wait(self, after, timeout):
+        """Wait until the head seq passes `after`; returns the head, or None on timeout."""
+        self._ensure_poller()
+        async with self._condition:
+            try:
+                await asyncio.wait_for(
+                    self._condition.wait_for(lambda: self.head is not None and self.head > after), timeout
+                )
+            except asyncio.TimeoutError:
+                return None
+        return self.head
+
+    def _ensure_poller(self):
+        if self._poller is None or self._poller.done():
+            self._poller = self._loop.create_task(self._poll())
+
+    async def _poll(self):
+        while self._subscribers:
+            try:
+                head = (await ItemChange.objects.aaggregate(head=Max("seq")))["head"] or 0
+            except Exception:
+                logger.exception("Polling the item change log failed")
+                head = self.head
+            if head != self.head:
+                self.head = head
+                async with self._condition:
+                    self._condition.notify_all()
+            await asyncio.sleep(settings.ITEMS_FEED_POLL_INTERVAL)
+
+
+feed_hub = ChangeFeedHub()
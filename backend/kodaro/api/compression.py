@@ -0,0 +1,143 @@
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional: `pip install brotli`
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: `pip install zstandard`
+    zstandard = None
+
+
+class GzipCompressor:
+    def __init__(self, level):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 → gzip container
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._obj.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, level):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._obj.process(data)
+
+    def flush(self):
+        return self._obj.flush()
+
+    def finish(self):
+        return self._obj.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._obj.flush()
+
+
+# Content-Encoding token → compressor, for the codecs importable in this environment.
+COMPRESSORS = {"gzip": GzipCompressor}
+if brotli is not None:
+    COMPRESSORS["br"] = BrotliCompressor
+if zstandard is not None:
+    COMPRESSORS["zstd"] = ZstdCompressor
+
+
+def parse_accept_encoding(header):
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate(header, preference):
+    """
+    Pick the coding to use for `header` from `preference` (server order, best first),
+    restricted to available codecs. The client's q-values win; ties go to server order.
+    Returns None when nothing acceptable is available.
+    """
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in preference:
+        if coding not in COMPRESSORS:
+            continue
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(coding, level, data):
+    compressor = COMPRESSORS[coding](level)
+    return compressor.compress(data) + compressor.finish()
+
+
+class _StreamState:
+    """
+    Feeds chunks of a streamed body to a compressor and flushes whenever `flush_size`
+    input bytes have accumulated, so clients receive data progressively without paying
+    a flush per (often tiny, e.g. one NDJSON row) chunk.
+    """
+
+    def __init__(self, coding, level, flush_size):
+        self.compressor = COMPRESSORS[coding](level)
+        self.flush_size = flush_size
+        self.pending = 0
+
+    def feed(self, data):
+        out = self.compressor.compress(data)
+        self.pending += len(data)
+        if self.pending >= self.flush_size:
+            self.pending = 0
+            out += self.compressor.flush()
+        return out
+
+
+def compress_stream(coding, level, chunks, flush_size):
+    state = _StreamState(coding, level, flush_size)
+    for data in chunks:
+        out = state.feed(data)
+        if out:
+            yield out
+    yield state.compressor.finish()
+
+
+async def acompress_stream(coding, level, chunks, flush_size):
+    state = _StreamState(coding, level, flush_size)
+    async for data in chunks:
+        out = state.feed(data)
+        if out:
+            yield out
+    yield state.compressor.finish()
@@ -0,0 +1,94 @@
+import csv
+import datetime
+import decimal
+import uuid
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils import encoders
+from rest_framework.views import APIView
+
+from Users.authentication import StatelessJWTAuthentication
+from .renderers import dumps
+
+_encoder = encoders.JSONEncoder()
+
+
+class NDJSONRenderer(BaseRenderer):
+    """One JSON document per line. `render` only handles non-streamed bodies such as errors."""
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b"".join(self.stream([data], None))
+
+    def stream(self, rows, fields):
+        for row in rows:
+            yield dumps(row) + b"\n"
+
+
+class _Echo:
+    """Pseudo-buffer for csv.writer: `write` hands the formatted line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def _cell(value):
+    # Format dates, UUIDs and decimals as the JSON renderers do.
+    if isinstance(value, (datetime.date, datetime.time, uuid.UUID, decimal.Decimal)):
+        return _encoder.default(value)
+    return value
+
+
+class CSVRenderer(BaseRenderer):
+    """Header row followed by one line per row. `render` only handles non-streamed bodies such as errors."""
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, dict):
+            data = {"detail": data}
+        return b"".join(self.stream([data], list(data)))
+
+    def stream(self, rows, fields):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(fields).encode(self.charset)
+        for row in rows:
+            yield writer.writerow([_cell(row.get(name)) for name in fields]).encode(self.charset)
+
+
+class ExportView(APIView):
+    """
+    Base view for streaming exports.
+    Rows are read with `.values().iterator(chunk_size=EXPORT_CHUNK_SIZE)` and written one at a time
+    into a `StreamingHttpResponse`, so memory use is constant and the first bytes are sent
+    before the last row is read. That holds under WSGI only: under ASGI Django consumes a
+    sync iterator with `sync_to_async(list)`, so the whole body is built in memory first.
+    The format is negotiated from `Accept` or `?format=ndjson|csv`; as elsewhere in DRF,
+    `?format=` picks the renderer and a conflicting `Accept` then gets a 406.
+    """
+    authentication_classes = [StatelessJWTAuthentication]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    serializer_class = None
+    queryset = None
+    filename = "export"
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+    def get(self, request):
+        serializer_class = self.serializer_class
+        fields = serializer_class.values_fields()
+        queryset = serializer_class.values_queryset(self.get_queryset())
+        rows = serializer_class.values_rows(queryset.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE))
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(rows, fields),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{self.filename}.{renderer.format}"'
+        return response
@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended.
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+current_metrics = ContextVar("current_metrics", default=None)
+
+
+class RequestMetrics:
+    """Timings collected while one request is handled."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.timings = Counter()
+        self.statements = Counter()
+        self.counters = Counter()
+
+    def add(self, name, seconds):
+        self.timings[name] += seconds
+
+    def duplicate_statements(self, threshold):
+        """SQL statements (ignoring parameters) executed at least `threshold` times: likely N+1s."""
+        return {sql: count for sql, count in self.statements.items() if count >= threshold}
+
+
+@contextmanager
+def timed(name):
+    """Attribute the enclosed block's wall time to `name` (e.g. "serialize") in the current request."""
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(name, time.perf_counter() - start)
+
+
+def incr(name, amount=1):
+    """Add to the named counter (e.g. "profile_cache_hits") of the current request, if any."""
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.counters[name] += amount
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper installed on every DB connection (see ApiConfig.ready).
+    It is a no-op outside an instrumented request; the ContextVar follows requests
+    into sync_to_async threads, so async views are measured too.
+    """
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - start
+        metrics.db_queries += 1
+        metrics.statements[sql] += 1
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def observe(self, value_ms):
+        self.count += 1
+        self.total += value_ms
+        for index, bound in enumerate(BUCKETS_MS):
+            if value_ms <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def as_dict(self):
+        labels = [f"le_{bound}" for bound in BUCKETS_MS] + ["inf"]
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class MetricsRegistry:
+    """Per-process aggregates keyed by URL name: latency/DB-time histograms, query totals and counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, url_name, metrics, wall_ms, size):
+        with self._lock:
+            endpoint = self._endpoints.get(url_name)
+            if endpoint is None:
+                endpoint = self._endpoints[url_name] = {
+                    "wall_ms": Histogram(),
+                    "db_ms": Histogram(),
+                    "db_queries": 0,
+                    "bytes": 0,
+                    "n_plus_one": 0,
+                    "counters": Counter(),
+                }
+            endpoint["wall_ms"].observe(wall_ms)
+            endpoint["db_ms"].observe(metrics.db_time * 1000)
+            endpoint["db_queries"] += metrics.db_queries
+            endpoint["bytes"] += size or 0
+            endpoint["counters"].update(metrics.counters)
+
+    def flag_n_plus_one(self, url_name):
+        with self._lock:
+            if url_name in self._endpoints:
+                self._endpoints[url_name]["n_plus_one"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: {
+                    "requests": data["wall_ms"].count,
+                    "wall_ms": data["wall_ms"].as_dict(),
+                    "db_ms": data["db_ms"].as_dict(),
+                    "db_queries_per_request": data["db_queries"] / max(data["wall_ms"].count, 1),
+                    "bytes_per_request": data["bytes"] / max(data["wall_ms"].count, 1),
+                    "n_plus_one_requests": data["n_plus_one"],
+                    "counters": dict(data["counters"]),
+                }
+                for name, data in self._endpoints.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+registry = MetricsRegistry()
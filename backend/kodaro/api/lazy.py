@@ -0,0 +1,33 @@
+from asgiref.sync import markcoroutinefunction
+from django.utils.module_loading import import_string
+
+
+def lazy_view(dotted_path, is_async=False, **initkwargs):
+    """
+    URLconf entry for the class-based view at `dotted_path`, imported and built with
+    `.as_view(**initkwargs)` on its first request rather than when the URLconf loads,
+    so a worker only imports the views (and their serializers, DRF/simplejwt modules,
+    ...) it actually serves. `is_async` must match the view, since Django decides how
+    to call a view before it is imported. Views are CSRF-exempt like DRF's: the API
+    authenticates with bearer tokens, not cookies.
+    """
+    view = None
+
+    def load():
+        nonlocal view
+        if view is None:
+            view = import_string(dotted_path).as_view(**initkwargs)
+        return view
+
+    if is_async:
+        async def dispatch(request, *args, **kwargs):
+            return await load()(request, *args, **kwargs)
+
+        markcoroutinefunction(dispatch)
+    else:
+        def dispatch(request, *args, **kwargs):
+            return load()(request, *args, **kwargs)
+
+    dispatch.csrf_exempt = True
+    dispatch.view_path = dotted_path
+    return dispatch
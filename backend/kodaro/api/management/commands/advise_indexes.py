@@ -0,0 +1,368 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from django.db.models.sql.where import AND, WhereNode
+from django.test import RequestFactory
+from django.utils import timezone
+
+from api.models import Item, ItemChange
+from api.pagination import UserCursorPagination
+from api.search import search_items
+from Users.search import filter_users
+from .benchmark import seed
+
+User = get_user_model()
+
+EQUALITY_LOOKUPS = {"exact", "in", "isnull"}
+RANGE_LOOKUPS = {"gt", "gte", "lt", "lte", "range", "startswith"}
+# SQLite EXPLAIN QUERY PLAN rows that read a whole table but aren't worth an index.
+SQLITE_HARMLESS_SCANS = ("VIRTUAL TABLE", "CONSTANT ROW")
+
+
+@dataclass
+class Probe:
+    """One ORM query a view or admin page runs, rebuilt with representative parameters."""
+    name: str
+    build: Callable
+    model: type = None
+    findings: list = field(default_factory=list)
+    plan: list = field(default_factory=list)
+    proposal: list = None
+    covered_by: str = None
+    advice: list = field(default_factory=list)
+
+
+def query_shape(queryset):
+    """
+    `(equality, range, order, unindexable)` field names used on the queryset's own table.
+    OR-ed and negated conditions are skipped: a composite B-tree index can't serve them.
+    """
+    model = queryset.model
+    equality, ranges, unindexable = [], [], []
+
+    def walk(node):
+        for child in node.children:
+            if isinstance(child, WhereNode):
+                if child.connector == AND and not child.negated:
+                    walk(child)
+                continue
+            target = getattr(getattr(child, "lhs", None), "target", None)
+            if target is None or target.model is not model:
+                continue
+            if child.lookup_name in EQUALITY_LOOKUPS:
+                bucket = equality
+            elif child.lookup_name in RANGE_LOOKUPS:
+                bucket = ranges
+            else:
+                bucket = unindexable
+            entry = target.name if bucket is not unindexable else f"{target.name}__{child.lookup_name}"
+            if entry not in bucket:
+                bucket.append(entry)
+
+    walk(queryset.query.where)
+    order = list(queryset.query.order_by)
+    if not order and queryset.query.default_ordering:
+        order = list(model._meta.ordering)
+    pk_name = model._meta.pk.name
+    order = [name.replace("pk", pk_name) if name.lstrip("-") == "pk" else name for name in order]
+    order = [name for name in order if "__" not in name and "." not in name and "?" not in name]
+    return equality, ranges, order, unindexable
+
+
+def existing_indexes(model):
+    """Name → leading field names (directions dropped) of every index Django knows about on `model`."""
+    indexes = {f"{model._meta.db_table}_pkey": [model._meta.pk.name]}
+    for index in model._meta.indexes:
+        if index.fields:
+            indexes[index.name] = [name.lstrip("-") for name in index.fields]
+    for constraint in model._meta.constraints:
+        if isinstance(constraint, models.UniqueConstraint) and constraint.fields:
+            indexes[constraint.name] = list(constraint.fields)
+    for fields in model._meta.unique_together:
+        indexes["unique_together " + ",".join(fields)] = list(fields)
+    for model_field in model._meta.concrete_fields:
+        if (model_field.db_index or model_field.unique) and not model_field.primary_key:
+            indexes[f"{model_field.name} (db_index/unique)"] = [model_field.name]
+    return indexes
+
+
+def propose_index(queryset):
+    """
+    Fields for a composite index following the equality → sort → range rule, or None.
+    Returns `(fields, covered_by)`; `covered_by` names an existing index with the same leading columns.
+    """
+    equality, ranges, order, _ = query_shape(queryset)
+    pk_name = queryset.model._meta.pk.name
+    equality = [name for name in equality if name != pk_name]
+    if not equality and ranges and order and order[0].lstrip("-") != ranges[0]:
+        # A range on one column and a sort on another can't come from one B-tree; see advice().
+        return None, None
+    fields = []
+    for name in equality + order + ranges:
+        if name.lstrip("-") not in [existing.lstrip("-") for existing in fields]:
+            fields.append(name)
+    if not fields or fields[0].lstrip("-") == pk_name:
+        return None, None
+    bare = [name.lstrip("-") for name in fields]
+    for index_name, index_fields in existing_indexes(queryset.model).items():
+        if index_fields[:len(bare)] == bare:
+            return fields, index_name
+    return fields, None
+
+
+def index_name(model, fields):
+    """A name within Django's 30 character limit for Index.name."""
+    base = "_".join([model._meta.model_name] + [name.lstrip("-") for name in fields])
+    if len(base) + 4 <= 30:
+        return f"{base}_idx"
+    return f"{base[:21]}_{hashlib.sha1(base.encode()).hexdigest()[:4]}_idx"
+
+
+def sqlite_plan(queryset):
+    """EXPLAIN QUERY PLAN detail lines, plus findings: filtered table scans and temp B-tree sorts."""
+    table = queryset.model._meta.db_table
+    filtered = bool(queryset.query.where)
+    lines, findings = [], []
+    for row in queryset.explain().splitlines():
+        detail = row.split(" ", 3)[-1]
+        lines.append(detail)
+        if detail.startswith("SCAN ") and "USING" not in detail and not detail.endswith(SQLITE_HARMLESS_SCANS):
+            scanned = detail.split()[1]
+            if scanned == table and filtered:
+                findings.append(f"full scan of {scanned}")
+        elif "USE TEMP B-TREE" in detail:
+            findings.append(detail.lower())
+    return lines, findings
+
+
+def postgres_plan(queryset):
+    """EXPLAIN text, plus findings from the JSON plan: filtered sequential scans and sorts."""
+    lines = queryset.explain().splitlines()
+    findings = []
+
+    def walk(node):
+        if node["Node Type"] == "Seq Scan" and "Filter" in node:
+            findings.append(f"sequential scan of {node['Relation Name']} (filter: {node['Filter']})")
+        elif node["Node Type"] in ("Sort", "Incremental Sort"):
+            findings.append(f"{node['Node Type'].lower()} on {', '.join(node.get('Sort Key', []))}")
+        for sub in node.get("Plans", []):
+            walk(sub)
+
+    # Django flattens psycopg's decoded `[{"Plan": …}]` to the inner object; a raw string keeps the list.
+    document = json.loads(queryset.explain(format="json"))
+    walk((document[0] if isinstance(document, list) else document)["Plan"])
+    return lines, findings
+
+
+EXPLAINERS = {"sqlite": sqlite_plan, "postgresql": postgres_plan}
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay the querysets behind items/, items/changes/, items/batch/, users/, users/batch/ and the "
+        "project's admin changelists (ordering, list_filter, search_fields) with representative parameters, "
+        "EXPLAIN them on SQLite or PostgreSQL, flag full scans and temp sorts, and print Meta.indexes "
+        "entries that would avoid them. --seed fills the tables first inside a rolled-back transaction, "
+        "so plans reflect a populated database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0, help="Items and users to seed (and ANALYZE) before planning.")
+        parser.add_argument("--only", action="append", help="Only probes whose name starts with this; may be repeated.")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print the plan of every probe, not just flagged ones.")
+        parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+        parser.add_argument("--check", action="store_true", help="Exit non-zero when a new index is proposed.")
+
+    def handle(self, *args, **options):
+        explain = EXPLAINERS.get(connection.vendor)
+        if explain is None:
+            raise CommandError(f"Plans can only be read on SQLite and PostgreSQL, not {connection.vendor}.")
+
+        with transaction.atomic():
+            if options["seed"]:
+                seed(options["seed"], options["seed"])
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE")
+            probes = [
+                probe for probe in self.probes()
+                if not options["only"] or probe.name.startswith(tuple(options["only"]))
+            ]
+            for probe in probes:
+                queryset = probe.build()
+                probe.model = queryset.model
+                probe.plan, probe.findings = explain(queryset)
+                probe.advice = self.advice(queryset)
+                if probe.findings:
+                    probe.proposal, probe.covered_by = propose_index(queryset)
+            transaction.set_rollback(True)
+
+        proposals = {}
+        for probe in probes:
+            if probe.findings and probe.proposal and not probe.covered_by:
+                proposals.setdefault(probe.model._meta.label, {})[tuple(probe.proposal)] = index_name(
+                    probe.model, probe.proposal
+                )
+
+        if options["json"]:
+            self.stdout.write(json.dumps({
+                "database": connection.vendor,
+                "probes": [
+                    {
+                        "name": probe.name, "plan": probe.plan, "findings": probe.findings,
+                        "proposal": probe.proposal, "covered_by": probe.covered_by, "advice": probe.advice,
+                    }
+                    for probe in probes
+                ],
+                "proposed_indexes": {
+                    label: [{"fields": list(fields), "name": name} for fields, name in entries.items()]
+                    for label, entries in proposals.items()
+                },
+            }, indent=2))
+        else:
+            self.print_report(probes, proposals, options["verbose_plans"])
+
+        if options["check"] and proposals:
+            count = sum(len(entries) for entries in proposals.values())
+            raise CommandError(f"{count} index(es) proposed.")
+
+    def probes(self):
+        item_name = Item.objects.values_list("name", flat=True).first() or "item"
+        email = User.objects.values_list("email", flat=True).first() or "user@example.com"
+        month_ago = (timezone.now() - timedelta(days=30)).date().isoformat()
+        items_page = settings.ITEMS_PAGE_SIZE + 1
+        users_page = settings.USERS_PAGE_SIZE + 1
+        ids = list(range(1, 51))
+
+        def items(params):
+            return lambda: search_items(Item.objects.order_by("id"), params).values()[:items_page]
+
+        def users(params):
+            return lambda: filter_users(User.objects.all(), params).order_by(*UserCursorPagination.ordering)[:users_page]
+
+        probes = [
+            Probe("items/", items({})),
+            Probe("items/ ?name=", items({"name": item_name})),
+            Probe("items/ ?prefix=", items({"prefix": item_name[:6]})),
+            Probe("items/ ?q=", items({"q": item_name.split("-")[0]})),
+            Probe("items/ ?cursor=", lambda: Item.objects.filter(id__gt=100).order_by("id").values()[:items_page]),
+            Probe("items/changes/ ?since=", lambda: ItemChange.objects.filter(seq__gt=100).order_by("seq")[:settings.ITEMS_CHANGES_PAGE_SIZE + 1]),
+            Probe("items/changes/ prune", lambda: ItemChange.objects.filter(
+                changed_at__lt=timezone.now() - timedelta(seconds=settings.ITEMS_CHANGES_RETENTION), seq__lt=1000,
+            ).values_list("seq", flat=True)[:1000]),
+            Probe("items/batch/", lambda: Item.objects.filter(pk__in=ids).order_by().values()),
+            Probe("users/", users({})),
+            Probe("users/ ?is_active=", users({"is_active": "true"})),
+            Probe("users/ ?is_staff=", users({"is_staff": "false"})),
+            Probe("users/ ?email=", users({"email": email[:5]})),
+            Probe("users/ ?joined_after=", users({"joined_after": month_ago})),
+            Probe("users/ ?is_active=&joined_after=", users({"is_active": "true", "joined_after": month_ago})),
+            Probe("users/batch/", lambda: User.objects.filter(
+                pk__in=list(User.objects.values_list("pk", flat=True)[:50])
+            ).order_by().values()),
+        ]
+        return probes + self.admin_probes(email)
+
+    def admin_probes(self, search_term):
+        """Changelist ordering, each simple list_filter and the search_fields of this project's ModelAdmins."""
+        if not apps.is_installed("django.contrib.admin"):
+            return []
+        from django.contrib import admin
+
+        request = RequestFactory().get("/admin/")
+        request.user = User(is_staff=True, is_superuser=True)
+        probes = []
+        for model, model_admin in admin.site._registry.items():
+            if not str(model._meta.app_config.path).startswith(str(settings.BASE_DIR)):
+                continue
+            label = f"admin {model._meta.label}"
+            ordering = list(model_admin.get_ordering(request) or model._meta.ordering or ())
+            # ChangeList makes the ordering total by adding the primary key.
+            if not {"pk", "-pk", model._meta.pk.name, f"-{model._meta.pk.name}"} & set(ordering):
+                ordering.append("-pk")
+            page = model_admin.list_per_page
+
+            def changelist(filters=None, model=model, ordering=ordering, page=page):
+                return lambda: model._default_manager.filter(**(filters or {})).order_by(*ordering)[:page]
+
+            probes.append(Probe(label, changelist()))
+            for name in model_admin.get_list_filter(request):
+                if not isinstance(name, str):
+                    continue
+                try:
+                    model_field = model._meta.get_field(name)
+                except Exception:
+                    continue
+                if isinstance(model_field, models.BooleanField):
+                    value = True
+                elif model_field.choices:
+                    value = model_field.choices[0][0]
+                else:
+                    continue
+                probes.append(Probe(f"{label} ?{name}=", changelist({name: value})))
+            if model_admin.get_search_fields(request):
+                def search(model_admin=model_admin, model=model, ordering=ordering, page=page):
+                    queryset, _ = model_admin.get_search_results(request, model._default_manager.all(), search_term[:5])
+                    return queryset.order_by(*ordering)[:page]
+
+                probes.append(Probe(f"{label} ?q=", search))
+        return probes
+
+    def advice(self, queryset):
+        """Notes for filters no B-tree index can serve, e.g. the admin's icontains search."""
+        notes = []
+        equality, ranges, order, unindexable = query_shape(queryset)
+        if not equality and ranges and order and order[0].lstrip("-") != ranges[0]:
+            notes.append(
+                f"the range on {ranges[0]} and ORDER BY {order[0].lstrip('-')} can't share one index; "
+                f"only the rows matching {ranges[0]} are sorted, which stays cheap while the range is selective"
+            )
+        for lookup in unindexable:
+            name, _, kind = lookup.rpartition("__")
+            if kind in ("icontains", "contains", "iexact", "iendswith", "endswith", "istartswith"):
+                note = (
+                    f"{lookup} can't use a B-tree index; a prefix search (`^{name}` in search_fields) "
+                    f"uses the existing index on {name}"
+                )
+                if connection.vendor == "postgresql":
+                    note += (
+                        f", or add a pg_trgm index: GinIndex(OpClass(Upper(\"{name}\"), name=\"gin_trgm_ops\"), "
+                        f"name=\"{index_name(queryset.model, [name, 'trgm'])}\") with TrigramExtension()"
+                    )
+                notes.append(note)
+        return notes
+
+    def print_report(self, probes, proposals, verbose_plans):
+        for probe in probes:
+            status = "FLAG" if probe.findings else "ok"
+            self.stdout.write(f"{status:<5} {probe.name}")
+            if probe.findings or verbose_plans:
+                for line in probe.plan:
+                    self.stdout.write(f"        plan: {line}")
+            for finding in probe.findings:
+                self.stdout.write(f"      ! {finding}")
+            if probe.findings and probe.covered_by:
+                self.stdout.write(
+                    f"      ~ {probe.covered_by} already leads with {probe.proposal}; the planner skipped it "
+                    "(small table or stale statistics: try --seed or ANALYZE)"
+                )
+            for note in probe.advice if probe.findings else ():
+                self.stdout.write(f"      → {note}")
+
+        flagged = sum(1 for probe in probes if probe.findings)
+        self.stdout.write(f"\n{len(probes)} queries planned on {connection.vendor}, {flagged} flagged.")
+        if not proposals:
+            self.stdout.write("No new indexes proposed.")
+            return
+        self.stdout.write("\nProposed Meta.indexes entries (then run makemigrations):")
+        for label, entries in proposals.items():
+            self.stdout.write(f"\n  # {label}")
+            for fields, name in entries.items():
+                self.stdout.write(f'  models.Index(fields={json.dumps(list(fields))}, name="{name}"),')
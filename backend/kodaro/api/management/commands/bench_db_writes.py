@@ -0,0 +1,85 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from api.models import Item
+from .benchmark import delete_items
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent write throughput of the configured database profile "
+        "(KODARO_DB_ENGINE=sqlite | sqlite-default | postgres). Writer threads each commit "
+        "small transactions while optional reader threads scan the table; rows created by "
+        "the benchmark are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=8, help="Concurrent writer threads.")
+        parser.add_argument("--readers", type=int, default=4, help="Concurrent reader threads.")
+        parser.add_argument("--transactions", type=int, default=200, help="Transactions per writer.")
+        parser.add_argument("--rows", type=int, default=5, help="Rows inserted per transaction.")
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        self.stdout.write(
+            f"profile={settings.DB_ENGINE} engine={settings.DATABASES[alias]['ENGINE']} "
+            f"writers={options['writers']} readers={options['readers']}"
+        )
+        start_id = Item.objects.using(alias).order_by("-id").values_list("id", flat=True).first() or 0
+
+        stop = threading.Event()
+        committed, errors, reads, created = [0], [0], [0], []
+        lock = threading.Lock()
+
+        def writer(worker):
+            try:
+                for n in range(options["transactions"]):
+                    try:
+                        with transaction.atomic(using=alias):
+                            items = Item.objects.using(alias).bulk_create([
+                                Item(name=f"bench-write-{worker}-{n}-{i}", description="x" * 100)
+                                for i in range(options["rows"])
+                            ])
+                    except OperationalError:
+                        with lock:
+                            errors[0] += 1
+                    else:
+                        with lock:
+                            committed[0] += 1
+                            created.extend(item.pk for item in items)
+            finally:
+                connections[alias].close()
+
+        def reader():
+            try:
+                while not stop.is_set():
+                    Item.objects.using(alias).filter(id__gt=start_id).count()
+                    with lock:
+                        reads[0] += 1
+            finally:
+                connections[alias].close()
+
+        readers = [threading.Thread(target=reader) for _ in range(options["readers"])]
+        writers = [threading.Thread(target=writer, args=(w,)) for w in range(options["writers"])]
+        start = time.perf_counter()
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        # Only the benchmark's own rows, not whatever else was written meanwhile.
+        delete_items(created, using=alias)
+        self.stdout.write(
+            f"{committed[0]} transactions ({committed[0] * options['rows']} rows) in {elapsed:.2f}s: "
+            f"{committed[0] / elapsed:,.0f} tx/sec, {committed[0] * options['rows'] / elapsed:,.0f} rows/sec, "
+            f"{errors[0]} lock errors, {reads[0] / elapsed:,.0f} reads/sec"
+        )
@@ -0,0 +1,58 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.models import Item
+from api.serializers import ItemSerializer
+from .benchmark import delete_items
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-row Item inserts (one serializer.save() and commit per row, as POST /items/ does) "
+        "with the bulk ingest path used by POST /items/bulk/, and report throughput in rows/sec. "
+        "Rows created by the benchmark are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000, help="Rows to insert per run.")
+        parser.add_argument(
+            "--batch-size", type=int, action="append", dest="batch_sizes",
+            help="Bulk batch size to measure; may be repeated (default: 100, 500, 2000).",
+        )
+        parser.add_argument("--skip-single", action="store_true", help="Only measure the bulk path.")
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        run = uuid.uuid4().hex[:8]
+        payload = [{"name": f"bench-{run}-{i}", "description": "x" * 200} for i in range(rows)]
+
+        try:
+            if not options["skip_single"]:
+                self.report("single", rows, self.run_single(payload))
+            for batch_size in options["batch_sizes"] or [100, 500, 2000]:
+                self.report(f"bulk(batch={batch_size})", rows, self.run_bulk(payload, batch_size))
+        finally:
+            # Only this run's rows, not whatever else was written meanwhile.
+            delete_items(list(Item.objects.filter(name__startswith=f"bench-{run}-").values_list("id", flat=True)))
+
+    def run_single(self, payload):
+        start = time.perf_counter()
+        for row in payload:
+            with transaction.atomic():
+                serializer = ItemSerializer(data=row)
+                serializer.is_valid(raise_exception=True)
+                serializer.save()
+        return time.perf_counter() - start
+
+    def run_bulk(self, payload, batch_size):
+        start = time.perf_counter()
+        serializer = ItemSerializer(data=payload, many=True, context={"batch_size": batch_size})
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return time.perf_counter() - start
+
+    def report(self, label, rows, elapsed):
+        self.stdout.write(f"{label:<20} {rows:>8} rows  {elapsed:8.3f}s  {rows / elapsed:12,.0f} rows/sec")
@@ -0,0 +1,67 @@
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Item
+from api.renderers import ORJSONRenderer
+from api.serializers import ItemSerializer
+from Users.serializers import UserSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-row serialization cost of the stock serializers + DRF JSONRenderer with the "
+        "`.values()` fast path + ORJSONRenderer, for items and users. Rows are seeded inside a "
+        "transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000, help="Rows to seed and serialize per model.")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per path; the fastest is reported.")
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        with transaction.atomic():
+            created_items = Item.objects.bulk_create(
+                [Item(name=f"bench-{i}", description="x" * 200) for i in range(rows)], batch_size=1000
+            )
+            created_users = User.objects.bulk_create(
+                [User(email=f"bench-{uuid.uuid4().hex}@example.com", first_name="Bench", last_name=str(i))
+                 for i in range(rows)],
+                batch_size=1000,
+            )
+            # Only the rows seeded here, whatever else the database holds.
+            items = Item.objects.filter(id__in=[item.pk for item in created_items]).order_by("id")
+            users = User.objects.filter(id__in=[user.pk for user in created_users]).order_by("date_joined", "id")
+
+            for label, serializer_class, queryset in (("items", ItemSerializer, items), ("users", UserSerializer, users)):
+                # A fresh queryset per run, so both paths pay for the query every time.
+                stock = self.measure(
+                    repeat, lambda: JSONRenderer().render(serializer_class(queryset.all(), many=True).data)
+                )
+                fast = self.measure(repeat, lambda: ORJSONRenderer().render(serializer_class.values_data(queryset.all())))
+                self.report(f"{label} stock", rows, stock)
+                self.report(f"{label} fast", rows, fast, stock)
+
+            transaction.set_rollback(True)
+
+    def measure(self, repeat, run):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def report(self, label, rows, elapsed, baseline=None):
+        line = f"{label:<14} {rows:>8} rows  {elapsed:8.3f}s  {elapsed / rows * 1e6:8.2f} µs/row"
+        if baseline is not None:
+            line += f"  {baseline / elapsed:5.1f}x"
+        self.stdout.write(line)
@@ -0,0 +1,267 @@
+import json
+import platform
+import statistics
+import time
+import uuid
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Callable
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.cache import items_version
+from api.models import Item
+from Users.activity import last_login_recorder
+from Users.tokens import CachedRefreshToken
+from .loadtest import percentile
+
+User = get_user_model()
+
+PASSWORD = "bench-Password-1"
+
+# Transaction control isn't counted against query budgets: it depends on the backend and on
+# whether a view's atomic() block is nested (SAVEPOINT) or outermost (BEGIN/COMMIT).
+TRANSACTION_CONTROL = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+def count_queries(captured):
+    return sum(1 for query in captured if not query["sql"].lstrip().upper().startswith(TRANSACTION_CONTROL))
+
+
+@dataclass
+class Scenario:
+    """One endpoint under test. `prepare(i)` builds the request kwargs outside the timed section."""
+    name: str
+    method: str
+    path: str
+    max_queries: int
+    expected_status: int = 200
+    prepare: Callable = field(default=lambda i: {})
+
+
+@dataclass
+class Seeded:
+    item_ids: list
+    user_ids: list
+    admin: object
+
+
+def seed(items, users):
+    """
+    Factories: `items` items and `users` users (plus one admin), all sharing one password hash.
+    Emails carry a per-call tag, so seeding never collides with existing or leftover accounts.
+    """
+    tag = uuid.uuid4().hex[:8]
+    password = make_password(PASSWORD)
+    created_items = Item.objects.bulk_create(
+        [Item(name=f"bench-item-{i}", description=f"benchmark item {i} " * 8) for i in range(items)],
+        batch_size=1000,
+    )
+    created_users = User.objects.bulk_create(
+        [User(email=f"bench-{tag}-{i}@example.com", first_name="Bench", last_name=str(i), password=password)
+         for i in range(users)],
+        batch_size=1000,
+    )
+    admin = User.objects.create_superuser(f"bench-admin-{tag}@example.com", PASSWORD)
+    # bulk_create sends no post_save, so cached items/ pages would otherwise outlive the seed.
+    items_version.bump_on_commit()
+    return Seeded([item.pk for item in created_items], [user.pk for user in created_users] + [admin.pk], admin)
+
+
+def delete_items(ids, using="default", chunk_size=1000):
+    """
+    Delete benchmark rows by id, one short transaction per chunk. The usual post_delete
+    receivers run, so cached item lists are invalidated and feed clients see the deletes.
+    """
+    ids = list(ids)
+    for start in range(0, len(ids), chunk_size):
+        with transaction.atomic(using=using):
+            Item.objects.using(using).filter(id__in=ids[start:start + chunk_size]).delete()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the API in-process (Django test client, no network) against the configured database. "
+        "Seeds --items/--users, then reports latency percentiles and throughput for items/ (cached and "
+        "cold), auth/login/, auth/token/refresh/, users/me/ and users/; every request commits as in "
+        "production, so on-commit cache invalidation is measured too. Seeded and created rows are deleted "
+        "afterwards. The run fails when an endpoint exceeds its query budget, counted over every "
+        "configured database alias (replicas included). --json / --output write results for "
+        "comparison; --baseline compares against an earlier run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=1000, help="Items to seed.")
+        parser.add_argument("--users", type=int, default=200, help="Users to seed.")
+        parser.add_argument("--iterations", type=int, default=200, help="Timed requests per endpoint.")
+        parser.add_argument("--warmup", type=int, default=10, help="Untimed requests per endpoint first.")
+        parser.add_argument("--only", action="append", help="Run only this endpoint; may be repeated.")
+        parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+        parser.add_argument("--output", help="Also write the JSON results to this file.")
+        parser.add_argument("--baseline", help="JSON file from an earlier run to compare p50/p99 against.")
+        parser.add_argument(
+            "--tolerance", type=float, default=20.0,
+            help="Percent p50/p99 slowdown against --baseline reported as a regression.",
+        )
+
+    def handle(self, *args, **options):
+        # Rate limits would reject the repeated logins; the client talks to "testserver".
+        # Buffered last_login values belong to users deleted afterwards, so they are never flushed.
+        run = uuid.uuid4().hex[:8]
+        with override_settings(
+            THROTTLE_BUCKETS={}, TASKS_EAGER=False, ALLOWED_HOSTS=["testserver"],
+            USERS_LAST_LOGIN_FLUSH_INTERVAL=3600,
+        ):
+            seeded = None
+            try:
+                # Atomic, so a seed that fails halfway leaves nothing behind.
+                with transaction.atomic():
+                    seeded = seed(options["items"], options["users"])
+                results = self.run_all(seeded, run, options)
+            finally:
+                last_login_recorder.discard()
+                created = Item.objects.filter(name__startswith=f"bench-new-{run}-").values_list("id", flat=True)
+                delete_items(list(created))
+                if seeded is not None:
+                    delete_items(seeded.item_ids)
+                    User.objects.filter(id__in=seeded.user_ids).delete()
+
+        report = {
+            "meta": {
+                "timestamp": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "django": django.get_version(),
+                "python": platform.python_version(),
+                "items": options["items"],
+                "users": options["users"],
+                "iterations": options["iterations"],
+            },
+            "results": results,
+        }
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(report, fh, indent=2)
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_table(results)
+
+        failures = [f"{r['endpoint']}: {r['max_queries']} queries > budget {r['query_budget']}"
+                    for r in results if r["max_queries"] > r["query_budget"]]
+        failures += [f"{r['endpoint']}: {r['errors']} unexpected responses" for r in results if r["errors"]]
+        if options["baseline"]:
+            failures += self.compare(results, options["baseline"], options["tolerance"])
+        if failures:
+            raise CommandError("Benchmark failed:\n  " + "\n  ".join(failures))
+
+    def scenarios(self, seeded, run):
+        user = User.objects.get(pk=seeded.user_ids[0])
+        user_token = str(RefreshToken.for_user(user).access_token)
+        admin_token = str(RefreshToken.for_user(seeded.admin).access_token)
+        as_user = {"HTTP_AUTHORIZATION": f"Bearer {user_token}"}
+        as_admin = {"HTTP_AUTHORIZATION": f"Bearer {admin_token}"}
+
+        def json_body(data, **extra):
+            return {"data": data, "content_type": "application/json", **extra}
+
+        return [
+            Scenario("items-list", "get", "/api/items/?page_size=50", max_queries=2,
+                     prepare=lambda i: as_user),
+            # A new URL every time, so each request misses the response cache.
+            Scenario("items-cold", "get", "/api/items/", max_queries=1,
+                     prepare=lambda i: {"data": {"page_size": 50, "prefix": f"bench-item-{i}"}, **as_user}),
+            Scenario("items-create", "post", "/api/items/", max_queries=3, expected_status=201,
+                     prepare=lambda i: json_body({"name": f"bench-new-{run}-{i}", "description": "x"}, **as_user)),
+            Scenario("auth-login", "post", "/api/auth/login/", max_queries=2,
+                     prepare=lambda i: json_body({"email": user.email, "password": PASSWORD})),
+            # Refresh tokens rotate and are blacklisted on use, so each request gets a fresh one.
+            Scenario("token-refresh", "post", "/api/auth/token/refresh/", max_queries=9,
+                     prepare=lambda i: json_body({"refresh": str(CachedRefreshToken.for_user(user))})),
+            Scenario("users-me", "get", "/api/users/me/", max_queries=1,
+                     prepare=lambda i: as_user),
+            Scenario("users-list", "get", "/api/users/", max_queries=2,
+                     prepare=lambda i: as_admin),
+        ]
+
+    def run_all(self, seeded, run, options):
+        client = Client()
+        results = []
+        for scenario in self.scenarios(seeded, run):
+            if options["only"] and scenario.name not in options["only"]:
+                continue
+            for i in range(options["warmup"]):
+                getattr(client, scenario.method)(scenario.path, **scenario.prepare(-1 - i))
+            results.append(self.run(client, scenario, options["iterations"]))
+        return results
+
+    def run(self, client, scenario, iterations):
+        send = getattr(client, scenario.method)
+        latencies, errors, max_queries, elapsed = [], 0, 0, 0.0
+        for i in range(iterations):
+            kwargs = scenario.prepare(i)
+            with ExitStack() as stack:
+                # Reads routed to replicas count against the budget as well.
+                captured = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+                start = time.perf_counter()
+                response = send(scenario.path, **kwargs)
+                took = time.perf_counter() - start
+            elapsed += took
+            latencies.append(took * 1000)
+            max_queries = max(max_queries, sum(count_queries(queries) for queries in captured))
+            if response.status_code != scenario.expected_status:
+                errors += 1
+
+        latencies.sort()
+        return {
+            "endpoint": scenario.name,
+            "method": scenario.method.upper(),
+            "path": scenario.path,
+            "requests": iterations,
+            "errors": errors,
+            "rps": iterations / elapsed if elapsed else 0.0,
+            "mean_ms": statistics.fmean(latencies),
+            "p50_ms": percentile(latencies, 50),
+            "p90_ms": percentile(latencies, 90),
+            "p99_ms": percentile(latencies, 99),
+            "max_ms": latencies[-1],
+            "max_queries": max_queries,
+            "query_budget": scenario.max_queries,
+        }
+
+    def print_table(self, results):
+        self.stdout.write(
+            f"{'endpoint':<14} {'req':>6} {'err':>4} {'req/s':>8} {'p50':>8} {'p90':>8} {'p99':>8} "
+            f"{'max':>8}  (ms)  {'queries':>9}"
+        )
+        for r in results:
+            self.stdout.write(
+                f"{r['endpoint']:<14} {r['requests']:>6} {r['errors']:>4} {r['rps']:>8.1f} {r['p50_ms']:>8.2f} "
+                f"{r['p90_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['max_ms']:>8.2f}        "
+                f"{r['max_queries']:>3}/{r['query_budget']:<3}"
+            )
+
+    def compare(self, results, path, tolerance):
+        with open(path) as fh:
+            baseline = {r["endpoint"]: r for r in json.load(fh)["results"]}
+        regressions = []
+        self.stdout.write(f"\nAgainst {path}:")
+        for r in results:
+            base = baseline.get(r["endpoint"])
+            if base is None:
+                continue
+            deltas = []
+            for metric in ("p50_ms", "p99_ms"):
+                change = (r[metric] - base[metric]) / base[metric] * 100 if base[metric] else 0.0
+                deltas.append(f"{metric[:3]} {change:+6.1f}%")
+                if change > tolerance:
+                    regressions.append(f"{r['endpoint']}: {metric} {base[metric]:.2f} → {r[metric]:.2f} ms ({change:+.1f}%)")
+            self.stdout.write(f"  {r['endpoint']:<14} " + "  ".join(deltas))
+        return regressions
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import statistics
+import time
+import urllib.request
+from urllib.parse import urljoin, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test running servers and compare latency percentiles, e.g. the same project under "
+        "`gunicorn kodaro.wsgi` and `uvicorn kodaro.asgi:application`:\n\n"
+        "  manage.py loadtest --target wsgi=http://127.0.0.1:8000 --target asgi=http://127.0.0.1:8001 "
+        "--path /api/items/?page_size=50 --path /api/async/items/?page_size=50 "
+        "--email admin@example.com --password ... --concurrency 200 --requests 5000\n\n"
+        "Uses a plain asyncio HTTP/1.1 client (one connection per request), so a single process "
+        "can hold many concurrent connections open."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", action="append", required=True, metavar="NAME=URL",
+                            help="Server to test; may be repeated.")
+        parser.add_argument("--path", action="append", required=True, help="Path to request; may be repeated.")
+        parser.add_argument("--requests", type=int, default=1000, help="Requests per target and path.")
+        parser.add_argument("--concurrency", type=int, default=100, help="Requests in flight at once.")
+        parser.add_argument("--token", help="Access token to send as `Authorization: Bearer`.")
+        parser.add_argument("--email", help="Log in through the first target's /api/auth/login/ to get a token.")
+        parser.add_argument("--password")
+        parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+
+    def handle(self, *args, **options):
+        targets = []
+        for spec in options["target"]:
+            name, sep, url = spec.partition("=")
+            if not sep or urlsplit(url).scheme != "http":
+                raise CommandError(f"--target must look like name=http://host:port, got {spec!r}.")
+            targets.append((name, url))
+
+        token = options["token"]
+        if token is None and options["email"]:
+            token = self.login(targets[0][1], options["email"], options["password"])
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+        results = []
+        for name, base_url in targets:
+            for path in options["path"]:
+                url = urljoin(base_url, path)
+                results.append({
+                    "target": name,
+                    "path": path,
+                    **asyncio.run(self.run(url, headers, options["requests"], options["concurrency"])),
+                })
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{'target':<10} {'path':<40} {'ok':>6} {'err':>5} {'req/s':>8} "
+            f"{'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}  (ms)"
+        )
+        for r in results:
+            self.stdout.write(
+                f"{r['target']:<10} {r['path']:<40} {r['ok']:>6} {r['errors']:>5} {r['rps']:>8.1f} "
+                f"{r['p50_ms']:>8.1f} {r['p90_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}"
+            )
+
+    def login(self, base_url, email, password):
+        request = urllib.request.Request(
+            urljoin(base_url, "/api/auth/login/"),
+            data=json.dumps({"email": email, "password": password}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            return json.load(response)["access"]
+
+    async def run(self, url, headers, total, concurrency):
+        parts = urlsplit(url)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        request = (
+            f"GET {target} HTTP/1.1\r\nHost: {parts.netloc}\r\nConnection: close\r\n"
+            + "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+            + "\r\n"
+        ).encode()
+
+        latencies, errors = [], 0
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+                    writer.write(request)
+                    await writer.drain()
+                    status_line = await reader.readline()
+                    await reader.read()
+                    writer.close()
+                    status = int(status_line.split()[1])
+                except (OSError, IndexError, ValueError):
+                    errors += 1
+                    return
+                if status >= 400:
+                    errors += 1
+                    return
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        return {
+            "ok": len(latencies),
+            "errors": errors,
+            "rps": len(latencies) / elapsed if elapsed else 0.0,
+            "mean_ms": statistics.fmean(latencies) if latencies else 0.0,
+            "p50_ms": percentile(latencies, 50),
+            "p90_ms": percentile(latencies, 90),
+            "p99_ms": percentile(latencies, 99),
+            "max_ms": latencies[-1] if latencies else 0.0,
+        }
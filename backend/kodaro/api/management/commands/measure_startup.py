@@ -0,0 +1,134 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: loads the WSGI/ASGI application, then serves one request
+# through it, reporting time and resident memory after each step. RSS is read from
+# /proc (ru_maxrss is carried over from the parent across exec on Linux, so it would
+# report this command's own peak); elsewhere it falls back to ru_maxrss.
+CHILD = r"""
+import asyncio, importlib, io, json, resource, sys, time
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 if sys.platform != "darwin" else 1024 ** 2)
+
+
+start = time.perf_counter()
+module = importlib.import_module(sys.argv[1])
+loaded = time.perf_counter()
+loaded_rss = rss_mb()
+loaded_modules = len(sys.modules)
+
+path, _, query = sys.argv[2].partition("?")
+if sys.argv[1].endswith("asgi"):
+    statuses, received = [], []
+
+    async def receive():
+        if received:  # Django then listens for a disconnect until the response is sent.
+            await asyncio.Future()
+        received.append(True)
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+        "headers": [(b"host", b"localhost")], "server": ("localhost", 80), "client": ("127.0.0.1", 0),
+    }
+    asyncio.run(module.application(scope, receive, send))
+    status = statuses[0]
+else:
+    statuses = []
+    environ = {
+        "REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": query, "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80", "HTTP_HOST": "localhost", "SERVER_PROTOCOL": "HTTP/1.1",
+        "wsgi.input": io.BytesIO(), "wsgi.url_scheme": "http", "wsgi.errors": sys.stderr,
+    }
+    body = module.application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    b"".join(body)
+    status = int(statuses[0].split()[0])
+served = time.perf_counter()
+
+print(json.dumps({
+    "status": status,
+    "load_ms": (loaded - start) * 1000,
+    "first_request_ms": (served - loaded) * 1000,
+    "load_rss_mb": loaded_rss,
+    "rss_mb": rss_mb(),
+    "modules": loaded_modules,
+    "modules_after_request": len(sys.modules),
+}))
+"""
+
+METRICS = ["process_ms", "load_ms", "first_request_ms", "load_rss_mb", "rss_mb", "modules", "modules_after_request"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold start and memory of a worker: for each settings profile (KODARO_PROFILE) and "
+        "entry point (kodaro.wsgi, kodaro.asgi), start fresh interpreters that load the application "
+        "and serve one request through it, and report median load time, first-request time, "
+        "resident memory and loaded module counts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profile", action="append", help="Settings profile; may be repeated (default: full, api-only).")
+        parser.add_argument("--server", action="append", choices=["wsgi", "asgi"], help="Entry point (default: both).")
+        parser.add_argument("--path", default="/api/items/", help="Path of the request served after loading.")
+        parser.add_argument("--repeat", type=int, default=5, help="Fresh processes per combination; medians are reported.")
+        parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+
+    def handle(self, *args, **options):
+        results = []
+        for profile in options["profile"] or ["full", "api-only"]:
+            for server in options["server"] or ["wsgi", "asgi"]:
+                runs = [self.measure(profile, server, options["path"]) for _ in range(options["repeat"])]
+                results.append({
+                    "profile": profile,
+                    "server": server,
+                    "status": runs[-1]["status"],
+                    **{metric: statistics.median(run[metric] for run in runs) for metric in METRICS},
+                })
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{'profile':<10} {'server':<6} {'status':>6} {'process':>9} {'load':>8} {'1st req':>8} "
+            f"{'RSS load':>9} {'RSS':>8} {'modules':>13}"
+        )
+        for r in results:
+            self.stdout.write(
+                f"{r['profile']:<10} {r['server']:<6} {r['status']:>6} {r['process_ms']:>7.0f}ms "
+                f"{r['load_ms']:>6.0f}ms {r['first_request_ms']:>6.0f}ms {r['load_rss_mb']:>7.1f}MB "
+                f"{r['rss_mb']:>6.1f}MB {r['modules']:>6.0f}/{r['modules_after_request']:<6.0f}"
+            )
+
+    def measure(self, profile, server, path):
+        env = {**os.environ, "KODARO_PROFILE": profile, "DJANGO_SETTINGS_MODULE": "kodaro.settings"}
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-c", CHILD, f"kodaro.{server}", path],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        if proc.returncode != 0:
+            raise CommandError(f"{profile}/{server} failed:\n{proc.stderr}")
+        return {"process_ms": elapsed, **json.loads(proc.stdout.strip().splitlines()[-1])}
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.changes import prune_changes
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete item change-feed entries older than the retention window (ITEMS_CHANGES_RETENTION). "
+        "Clients holding an older cursor get 410 from items/changes/ and reload."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention", type=int, default=settings.ITEMS_CHANGES_RETENTION,
+            help="Seconds of change log to keep.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune_changes(timezone.now() - timedelta(seconds=options["retention"]))
+        self.stdout.write(f"Deleted {deleted} item change entries.")
@@ -0,0 +1,192 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from .compression import acompress_stream, compress, compress_stream, negotiate
+from .instrumentation import RequestMetrics, current_metrics, registry
+from .routers import RoutingState, routing_state
+
+logger = logging.getLogger("kodaro.performance")
+
+
+class PerformanceMiddleware:
+    """
+    Records wall time, DB query count/time, serializer and render time and response size
+    for each request, logs repeated identical SQL (likely N+1 queries) and feeds the
+    per-URL-name histograms served by metrics/. The timings are reported in a
+    `Server-Timing` header only to staff users, or to everyone when DEBUG is on: they
+    would otherwise tell any client how much work (and which queries) a request caused.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.PERF_INSTRUMENTATION:
+            return self.get_response(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not settings.PERF_INSTRUMENTATION:
+            return await self.get_response(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; time the rendering too.
+        metrics = current_metrics.get()
+        if metrics is not None:
+            start = time.perf_counter()
+            response.add_post_render_callback(lambda r: metrics.add("render", time.perf_counter() - start))
+        return response
+
+    def finish(self, request, response, metrics):
+        wall_ms = (time.perf_counter() - metrics.started) * 1000
+        size = None if response.streaming else len(response.content)
+        url_name = request.resolver_match.view_name if request.resolver_match else "<unresolved>"
+
+        if settings.DEBUG or getattr(getattr(request, "user", None), "is_staff", False):
+            entries = [
+                f'total;dur={wall_ms:.1f}',
+                f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.db_queries} queries"',
+            ]
+            entries += [f"{name};dur={seconds * 1000:.1f}" for name, seconds in sorted(metrics.timings.items())]
+            response["Server-Timing"] = ", ".join(entries)
+
+        registry.record(url_name, metrics, wall_ms, size)
+        duplicates = metrics.duplicate_statements(settings.PERF_NPLUSONE_THRESHOLD)
+        if duplicates:
+            registry.flag_n_plus_one(url_name)
+            for sql, count in duplicates.items():
+                logger.warning("Possible N+1 on %s: %d executions of %s", url_name, count, sql)
+        return response
+
+
+class ReplicaPinMiddleware:
+    """
+    Per-request state for api.routers.ReplicaRouter. A request that writes sets a
+    short-lived cookie; requests carrying it read from the primary, so e.g. a
+    RegisterView call followed by users/me/ sees the new account. Unsafe methods read
+    from the primary from the start, since their validation reads (uniqueness checks,
+    existence lookups) run before the first write and must not see a lagging replica.
+    """
+    sync_capable = True
+    async_capable = True
+    cookie_name = "kodaro_primary_pin"
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = self.start(request)
+        token = routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self.finish(response, state)
+
+    async def __acall__(self, request):
+        state = self.start(request)
+        token = routing_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self.finish(response, state)
+
+    def start(self, request):
+        return RoutingState(pinned=self.cookie_name in request.COOKIES or request.method not in self.safe_methods)
+
+    def finish(self, response, state):
+        if state.wrote and settings.REPLICA_DATABASES:
+            response.set_cookie(self.cookie_name, "1", max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite="Lax")
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with the best coding both sides support (zstd, br, gzip;
+    see COMPRESSION_ENCODINGS). Bodies under COMPRESSION_MIN_SIZE and content types
+    outside COMPRESSION_CONTENT_TYPES are sent as is. Streaming responses (exports)
+    are compressed on the fly. Strong ETags are weakened, since the compressed bytes
+    differ from the representation the ETag was computed for. Endpoints that return
+    tokens (COMPRESSION_EXCLUDED_URL_NAMES) are never compressed, against BREACH.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding") or response.status_code in (204, 304):
+            return response
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        if not content_type.startswith(tuple(settings.COMPRESSION_CONTENT_TYPES)):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        match = getattr(request, "resolver_match", None)
+        if match is not None and match.url_name in settings.COMPRESSION_EXCLUDED_URL_NAMES:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        coding = negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""), settings.COMPRESSION_ENCODINGS)
+        if coding is None:
+            return response
+        level = settings.COMPRESSION_LEVELS[coding]
+
+        if response.streaming:
+            stream = acompress_stream if response.is_async else compress_stream
+            response.streaming_content = stream(
+                coding, level, response.streaming_content, settings.COMPRESSION_STREAM_FLUSH_SIZE
+            )
+            del response["Content-Length"]
+        else:
+            compressed = compress(coding, level, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = coding
+        return response
@@ -0,0 +1,81 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+FTS_TABLE = "api_item_fts"
+SEARCH_CONFIG = "english"
+SEARCH_INDEX = "api_item_search_gin"
+
+# SQLite: an external-content FTS5 table over api_item, kept in sync by triggers.
+# Note that SQLite "remakes" api_item for most future AlterField operations, which
+# drops these triggers; such migrations must re-run SQLITE_FTS_TRIGGERS afterwards
+# (ApiConfig pins default_auto_field so the id column never needs one).
+SQLITE_FTS_TABLE = f"""
+CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+    name, description, content='api_item', content_rowid='id'
+)
+"""
+
+SQLITE_FTS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON api_item BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON api_item BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON api_item BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END
+    """,
+]
+
+
+def search_index():
+    return GinIndex(SearchVector("name", "description", config=SEARCH_CONFIG), name=SEARCH_INDEX)
+
+
+def create_full_text_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(SQLITE_FTS_TABLE)
+        for trigger in SQLITE_FTS_TRIGGERS:
+            schema_editor.execute(trigger)
+        schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    elif vendor == "postgresql":
+        # Built from the same SearchVector expression api.search queries with,
+        # so the planner can match it.
+        schema_editor.add_index(apps.get_model("api", "Item"), search_index())
+
+
+def drop_full_text_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif vendor == "postgresql":
+        schema_editor.remove_index(apps.get_model("api", "Item"), search_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='item',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.RunPython(create_full_text_index, drop_full_text_index),
+    ]
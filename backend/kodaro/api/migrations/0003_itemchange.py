@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2 on 2026-10-17 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_item_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemChange',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('item_id', models.BigIntegerField()),
+                ('op', models.CharField(choices=[('upsert', 'Created or updated'), ('delete', 'Deleted')], max_length=6)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['changed_at'], name='api_itemchange_changed_idx')],
+            },
+        ),
+    ]
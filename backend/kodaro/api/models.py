@@ -2,7 +2,30 @@ from django.db import models
 
 
 class Item(models.Model):
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, db_index=True)
     description = models.TextField()
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+
+class ItemChange(models.Model):
+    """
+    Append-only log of item writes, read by the change feed (api.changes).
+    `seq` only grows, so clients resume with `?since=<seq>` or `Last-Event-ID`.
+    `item_id` is not a foreign key: delete entries must outlive the row.
+    """
+
+    class Op(models.TextChoices):
+        UPSERT = "upsert", "Created or updated"
+        DELETE = "delete", "Deleted"
+
+    seq = models.BigAutoField(primary_key=True)
+    item_id = models.BigIntegerField()
+    op = models.CharField(max_length=6, choices=Op.choices)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["changed_at"], name="api_itemchange_changed_idx")]
+
+    def __str__(self):
+        return f"#{self.seq} {self.op} item {self.item_id}"
@@ -0,0 +1,97 @@
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination
+
+
+class ItemCursorPagination(CursorPagination):
+    """
+    Keyset pagination over Item primary keys.
+    Each page is a single indexed range scan (`WHERE id > <cursor> ORDER BY id LIMIT n`),
+    so the cost of a page does not depend on how deep into the table it is.
+    """
+    ordering = "id"
+    page_size = settings.ITEMS_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.ITEMS_MAX_PAGE_SIZE
+
+    def is_requested(self, request):
+        """Pagination is opt-in so existing clients keep receiving a plain list."""
+        return (
+            self.cursor_query_param in request.query_params
+            or self.page_size_query_param in request.query_params
+        )
+
+
+def estimate_count(queryset):
+    """
+    Cheap row-count estimate for `queryset`, for listings where an exact COUNT(*) would
+    cost a full scan. Postgres answers from planner statistics; SQLite answers unfiltered
+    counts from max(rowid) (exact unless rows were deleted). Anything else is counted exactly.
+    """
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    unfiltered = not queryset.query.where
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            if unfiltered:
+                # Quoted, or ::regclass folds mixed-case names such as "Users_user" to lowercase.
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [connection.ops.quote_name(table)]
+                )
+                row = cursor.fetchone()
+                if row and row[0] >= 0:
+                    return row[0]
+            else:
+                sql, params = queryset.query.sql_with_params()
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return plan[0]["Plan"]["Plan Rows"]
+        elif connection.vendor == "sqlite" and unfiltered:
+            cursor.execute(f"SELECT max(_rowid_) FROM {connection.ops.quote_name(table)}")
+            return cursor.fetchone()[0] or 0
+    return queryset.count()
+
+
+class EstimatedCountPaginator(Paginator):
+    """Django paginator whose total comes from estimate_count(), e.g. for the admin changelist."""
+
+    @cached_property
+    def count(self):
+        return estimate_count(self.object_list)
+
+
+class UserCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (date_joined, id), newest first, backed by the
+    matching composite index on Users.User.
+    `?count=exact|estimate` adds a total to the response; it is omitted by default
+    so large tables never pay for COUNT(*).
+    """
+    ordering = ("-date_joined", "-id")
+    page_size = settings.USERS_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.USERS_MAX_PAGE_SIZE
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        mode = request.query_params.get(self.count_query_param)
+        if mode == "exact":
+            self.count = queryset.count()
+        elif mode == "estimate":
+            self.count = estimate_count(queryset)
+        else:
+            self.count = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data = {"count": self.count, **response.data}
+        return response
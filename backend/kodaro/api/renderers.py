@@ -0,0 +1,51 @@
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils import encoders
+
+# UUIDs, datetimes and dataclasses are encoded natively; datetimes in UTC end in "Z" like DRF's.
+# Non-string keys cover payloads such as the bulk endpoint's per-row errors keyed by index.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_encoder = encoders.JSONEncoder()
+
+
+def _default(obj):
+    # Decimals, lazy translations, querysets, timedeltas, ... fall back to DRF's encoder.
+    return _encoder.default(obj)
+
+
+def dumps(data, option=0):
+    return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS | option)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Drop-in for DRF's JSONRenderer backed by orjson.
+    Produces compact UTF-8 output; `indent` in the Accept header or renderer context
+    switches to two-space indentation (the only width orjson supports).
+    """
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        option = 0
+        if (accepted_media_type and "indent=" in accepted_media_type) or (renderer_context or {}).get("indent"):
+            option = orjson.OPT_INDENT_2
+        return dumps(data, option)
+
+
+class ORJSONParser(BaseParser):
+    """Drop-in for DRF's JSONParser backed by orjson."""
+    media_type = "application/json"
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read() if stream is not None else b"")
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,86 @@
+import itertools
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+class RoutingState:
+    """Per-request routing flags: `pinned` sends reads to the primary, `wrote` records a write."""
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+routing_state = ContextVar("routing_state", default=None)
+
+_lock = threading.Lock()
+_round_robin = {}
+_in_flight = Counter()
+
+
+def choose_replica(replicas):
+    """Pick a replica alias by REPLICA_READ_STRATEGY: round_robin or least_loaded (fewest queries in flight)."""
+    if settings.REPLICA_READ_STRATEGY == "least_loaded":
+        with _lock:
+            return min(replicas, key=lambda alias: _in_flight[alias])
+    key = tuple(replicas)
+    with _lock:
+        cycle = _round_robin.get(key)
+        if cycle is None:
+            cycle = _round_robin[key] = itertools.cycle(replicas)
+        return next(cycle)
+
+
+def count_in_flight(execute, sql, params, many, context):
+    alias = context["connection"].alias
+    with _lock:
+        _in_flight[alias] += 1
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        with _lock:
+            _in_flight[alias] -= 1
+
+
+def install_in_flight_counter(sender, connection, **kwargs):
+    if connection.alias in settings.REPLICA_DATABASES and count_in_flight not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_in_flight)
+
+
+@contextmanager
+def use_primary():
+    """Send every read in the block to the primary, e.g. in scripts that read their own writes."""
+    token = routing_state.set(RoutingState(pinned=True))
+    try:
+        yield
+    finally:
+        routing_state.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Sends reads to the REPLICA_DATABASES aliases and writes to `default`.
+    Once a request writes, its remaining reads go to the primary as well, and
+    ReplicaPinMiddleware keeps that client on the primary for REPLICA_PIN_SECONDS
+    so it reads its own writes across requests despite replication lag.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = routing_state.get()
+        if not settings.REPLICA_DATABASES or (state is not None and state.pinned):
+            return "default"
+        return choose_replica(settings.REPLICA_DATABASES)
+
+    def db_for_write(self, model, **hints):
+        state = routing_state.get()
+        if state is not None:
+            state.pinned = state.wrote = True
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
@@ -0,0 +1,53 @@
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+# Must match the objects created by migration 0002_item_search.
+FTS_TABLE = "api_item_fts"
+SEARCH_CONFIG = "english"
+
+
+def search_items(queryset, query_params):
+    """
+    Apply the item search/filter query parameters to `queryset`:
+
+    - `?q=`       full-text search over name and description (SQLite FTS5 table,
+                  Postgres SearchVector + GIN index, `icontains` elsewhere)
+    - `?prefix=`  case-sensitive prefix match on name
+    - `?name=`    exact match on name
+
+    All three are answered from an index (see migration 0002_item_search).
+    """
+    name = query_params.get("name")
+    if name:
+        queryset = queryset.filter(name=name)
+
+    prefix = query_params.get("prefix")
+    if prefix:
+        # The range lets every backend use the name index; startswith keeps exact semantics.
+        queryset = queryset.filter(name__gte=prefix, name__lt=prefix + "\U0010ffff", name__startswith=prefix)
+
+    q = query_params.get("q", "").strip()
+    if q:
+        queryset = full_text_filter(queryset, q)
+    return queryset
+
+
+def full_text_filter(queryset, q):
+    vendor = connection.vendor
+    if vendor == "sqlite":
+        return queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [fts5_query(q)])
+        )
+    if vendor == "postgresql":
+        from django.contrib.postgres.search import SearchQuery, SearchVector
+
+        return queryset.annotate(
+            search=SearchVector("name", "description", config=SEARCH_CONFIG)
+        ).filter(search=SearchQuery(q, config=SEARCH_CONFIG, search_type="websearch"))
+    return queryset.filter(Q(name__icontains=q) | Q(description__icontains=q))
+
+
+def fts5_query(q):
+    """Quote each term so user input is never parsed as FTS5 syntax; terms are ANDed."""
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in q.split())
@@ -1,8 +1,120 @@
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
-from .models import Item
+from rest_framework.settings import api_settings
+from .cache import items_version
+from .models import Item, ItemChange
 
 
-class ItemSerializer(serializers.ModelSerializer):
+class ItemListSerializer(serializers.ListSerializer):
+    """
+    Bulk variant used for list payloads.
+    Invalid rows are collected in `row_errors` (keyed by their index in the payload)
+    instead of rejecting the whole batch, and the valid rows are written with
+    `bulk_create` in batches of `batch_size` inside a single transaction.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            message = self.error_messages["not_a_list"].format(input_type=type(data).__name__)
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]}, code="not_a_list")
+
+        if not self.allow_empty and not data:
+            message = self.error_messages["empty"]
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]}, code="empty")
+
+        if self.max_length is not None and len(data) > self.max_length:
+            message = self.error_messages["max_length"].format(max_length=self.max_length)
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]}, code="max_length")
+
+        self.row_errors = {}
+        valid = []
+        for index, row in enumerate(data):
+            try:
+                valid.append(self.run_child_validation(row))
+            except serializers.ValidationError as exc:
+                self.row_errors[index] = exc.detail
+        return valid
+
+    def create(self, validated_data):
+        from .changes import record_changes  # api.changes imports this module
+
+        batch_size = self.context.get("batch_size") or settings.ITEMS_BULK_BATCH_SIZE
+        model = self.child.Meta.model
+        with transaction.atomic():
+            created = model.objects.bulk_create(
+                [model(**attrs) for attrs in validated_data],
+                batch_size=batch_size,
+            )
+            # bulk_create sends no post_save, so invalidate cached item lists and
+            # log the new rows for the change feed explicitly.
+            items_version.bump_on_commit()
+            record_changes([item.pk for item in created], ItemChange.Op.UPSERT)
+        return created
+
+
+class ValuesSerializerMixin:
+    """
+    Fast read path for ModelSerializers whose fields are plain columns.
+    `values_queryset()` selects the serializer's columns with `.values()` and `values_rows()`
+    turns the resulting dicts into the serializer's output shape without instantiating models
+    or running fields; UUIDs and datetimes stay native for ORJSONRenderer to encode.
+    Fields that are not columns are filled in by `complete_row()` from the columns listed
+    for them in `values_requires`.
+    """
+    values_requires = {}
+
+    @classmethod
+    def values_fields(cls, fields=None):
+        return list(fields) if fields is not None else list(cls().fields)
+
+    @classmethod
+    def values_queryset(cls, queryset, fields=None):
+        columns = {f.attname for f in cls.Meta.model._meta.concrete_fields}
+        names = cls.values_fields(fields)
+        for name in list(names):
+            names.extend(column for column in cls.values_requires.get(name, ()) if column not in names)
+        return queryset.values(*[name for name in names if name in columns])
+
+    @classmethod
+    def values_rows(cls, rows, fields=None):
+        names = cls.values_fields(fields)
+        columns = {f.attname for f in cls.Meta.model._meta.concrete_fields}
+        if all(name in columns for name in names):
+            return rows
+        return ({name: row[name] for name in names} for row in map(cls.complete_row, rows))
+
+    @classmethod
+    def values_data(cls, queryset, fields=None):
+        return list(cls.values_rows(cls.values_queryset(queryset, fields), fields))
+
+    @classmethod
+    def complete_row(cls, row):
+        return row
+
+
+class ItemSerializer(ValuesSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Item
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+        list_serializer_class = ItemListSerializer
+
+
+def parse_fields(query_params, serializer_class, param="fields"):
+    """
+    Parse a `?fields=a,b` projection from `query_params` against the fields of `serializer_class`.
+    Returns None when no projection was requested. The list is passed as `fields` to
+    `values_queryset()` / `values_rows()`, which select and emit only those columns; the
+    primary key is always included so projected rows can still be paginated and matched.
+    """
+    raw = query_params.get(param)
+    if not raw:
+        return None
+    requested = [name.strip() for name in raw.split(",") if name.strip()]
+    available = serializer_class().fields
+    unknown = [name for name in requested if name not in available]
+    if unknown:
+        raise serializers.ValidationError({param: f"Unknown field(s): {', '.join(unknown)}."})
+    if "id" not in requested:
+        requested.insert(0, "id")
+    return requested
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import items_version
+from .changes import record_changes
+from .models import Item, ItemChange
+
+
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Item)
+def bump_items_version(sender, **kwargs):
+    items_version.bump_on_commit()
+
+
+@receiver(post_save, sender=Item)
+def log_item_saved(sender, instance, **kwargs):
+    record_changes([instance.pk], ItemChange.Op.UPSERT)
+
+
+@receiver(post_delete, sender=Item)
+def log_item_deleted(sender, instance, **kwargs):
+    record_changes([instance.pk], ItemChange.Op.DELETE)
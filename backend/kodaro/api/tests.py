@@ -1,3 +1,275 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import throttling
+from .changes import ChangesExpired, changes_since
+from .models import Item, ItemChange
+from .pagination import estimate_count
+from .views import ItemsBatchView
+
+
+@override_settings(THROTTLE_STORE="local", THROTTLE_BUCKETS={"login": {"ip": ("1/hour", 3)}})
+class IPBucketThrottleTests(TestCase):
+    def setUp(self):
+        throttling._stores.clear()
+
+    def tearDown(self):
+        throttling._stores.clear()
+
+    def login(self, **headers):
+        return self.client.post(
+            "/api/auth/login/", {"email": "nobody@example.com", "password": "wrong"},
+            content_type="application/json", **headers,
+        )
+
+    def test_spoofed_forwarded_for_shares_the_remote_addr_bucket(self):
+        statuses = [self.login(HTTP_X_FORWARDED_FOR=f"10.0.0.{n}").status_code for n in range(5)]
+        self.assertNotIn(429, statuses[:3])
+        self.assertEqual(statuses[3:], [429, 429])
+
+    def test_forwarded_for_is_used_behind_trusted_proxies(self):
+        with self.settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}):
+            statuses = [self.login(HTTP_X_FORWARDED_FOR=f"10.0.0.{n}").status_code for n in range(5)]
+        self.assertNotIn(429, statuses)
+
+
+class ReplicaRoutingTests(TestCase):
+    """Reads may go to a second SQLite file standing in for a replica that lags behind the primary."""
+    # Resolved in setUpClass, after the replica alias is registered.
+    databases = "__all__"
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        connections.settings["stale_replica"] = {
+            **connections.settings["default"], "NAME": str(Path(cls.tmpdir) / "replica.sqlite3"),
+        }
+        call_command("migrate", database="stale_replica", verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections["stale_replica"].close()
+        del connections["stale_replica"]
+        del connections.settings["stale_replica"]
+        shutil.rmtree(cls.tmpdir)
+
+    def test_registration_uniqueness_check_reads_the_primary(self):
+        get_user_model().objects.create_user("taken@example.com", "pw-Unused-123")
+        with override_settings(REPLICA_DATABASES=["stale_replica"], THROTTLE_BUCKETS={}):
+            response = self.client.post("/api/auth/register/", {
+                "email": "taken@example.com", "first_name": "A", "last_name": "B",
+                "password": "Correct-Horse-42", "password_confirm": "Correct-Horse-42",
+            }, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("email", response.json())
+
+
+class ItemsListCacheTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user("reader@example.com", "pw-Unused-123")
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+
+    def test_etag_follows_the_body(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Item.objects.create(name="first")
+        response = self.client.get("/api/items/", **self.auth)
+        etag = response["ETag"]
+        self.assertEqual(self.client.get("/api/items/", HTTP_IF_NONE_MATCH=etag, **self.auth).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Item.objects.create(name="second")
+        response = self.client.get("/api/items/", HTTP_IF_NONE_MATCH=etag, **self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()), 2)
+
+
+class ItemsBulkTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user("loader@example.com", "pw-Unused-123")
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+
+    def post(self, rows):
+        return self.client.post("/api/items/bulk/", rows, content_type="application/json", **self.auth)
+
+    def test_partial_success_reports_rows_by_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post([
+                {"name": "one", "description": "ok"},
+                {"name": "", "description": "blank name"},
+                {"name": "two", "description": "ok"},
+                {"description": "no name"},
+            ])
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual(body["created"], 2)
+        self.assertEqual(sorted(body["errors"]), ["1", "3"])
+        self.assertIn("name", body["errors"]["1"])
+        self.assertEqual(sorted(Item.objects.values_list("name", flat=True)), ["one", "two"])
+        self.assertEqual(ItemChange.objects.count(), 2)
+
+    def test_all_invalid_batch_creates_nothing(self):
+        response = self.post([{"name": ""}, {"name": "x" * 101, "description": "too long"}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["created"], 0)
+        self.assertEqual(sorted(response.json()["errors"]), ["0", "1"])
+        self.assertFalse(Item.objects.exists())
+
+    def test_empty_list_is_a_validation_error(self):
+        response = self.post([])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("non_field_errors", response.json())
+
+    @override_settings(ITEMS_BULK_MAX_ROWS=2)
+    def test_oversize_payload_is_rejected_whole(self):
+        response = self.post([{"name": str(n), "description": ""} for n in range(3)])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("non_field_errors", response.json())
+        self.assertFalse(Item.objects.exists())
+
+
+class ItemsBatchTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user("batcher@example.com", "pw-Unused-123")
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+        self.ids = [item.pk for item in Item.objects.bulk_create(Item(name=f"item {n}", description="") for n in range(4))]
+
+    @override_settings(BATCH_LOOKUP_CHUNK_SIZE=2)
+    def test_results_follow_request_order_across_chunks(self):
+        wanted = self.ids[::-1]
+        response = self.client.get("/api/items/batch/", {"ids": ",".join(map(str, wanted))}, **self.auth)
+        self.assertEqual([row["id"] for row in response.json()["results"]], wanted)
+        self.assertEqual(response.json()["missing"], [])
+
+    def test_missing_and_duplicate_ids(self):
+        gone = max(self.ids) + 100
+        response = self.client.post(
+            "/api/items/batch/?fields=id", {"ids": [self.ids[1], gone, self.ids[0], self.ids[1], gone]},
+            content_type="application/json", **self.auth,
+        )
+        self.assertEqual(response.json(), {"results": [{"id": self.ids[1]}, {"id": self.ids[0]}], "missing": [gone]})
+
+    def test_id_list_limits(self):
+        with mock.patch.object(ItemsBatchView, "max_ids", 2):
+            response = self.client.get("/api/items/batch/", {"ids": ",".join(map(str, self.ids[:3]))}, **self.auth)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("ids", response.json())
+        self.assertEqual(self.client.get("/api/items/batch/", **self.auth).status_code, 400)
+        self.assertEqual(self.client.get("/api/items/batch/", {"ids": "1,x"}, **self.auth).status_code, 400)
+
+
+class FullTextSearchTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user("searcher@example.com", "pw-Unused-123")
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+
+    def search(self, q):
+        caches[settings.ITEMS_CACHE_ALIAS].clear()
+        response = self.client.get("/api/items/", {"q": q}, **self.auth)
+        self.assertEqual(response.status_code, 200)
+        return sorted(row["name"] for row in response.json())
+
+    def test_index_follows_inserts_updates_and_deletes(self):
+        kettle = Item.objects.create(name="kettle", description="boils water")
+        Item.objects.bulk_create([Item(name="teapot", description="brews tea"), Item(name="mug", description="holds tea")])
+        self.assertEqual(self.search("tea"), ["mug", "teapot"])
+        self.assertEqual(self.search("boils water"), ["kettle"])
+
+        kettle.description = "brews tea too"
+        kettle.save()
+        Item.objects.filter(name="mug").update(description="holds coffee")
+        self.assertEqual(self.search("tea"), ["kettle", "teapot"])
+        self.assertEqual(self.search("water"), [])
+        self.assertEqual(self.search("coffee"), ["mug"])
+
+        Item.objects.filter(name="teapot").delete()
+        self.assertEqual(self.search("tea"), ["kettle"])
+
+    def test_query_syntax_is_treated_as_terms(self):
+        Item.objects.create(name="kettle", description='"quoted" AND boils')
+        self.assertEqual(self.search('AND "quoted'), ["kettle"])
+
+    def test_no_pending_migrations(self):
+        # A pending AlterField on api_item would remake the table and drop the FTS triggers.
+        call_command("makemigrations", "api", check=True, dry_run=True, verbosity=0)
+
+
+class ChangesSinceTests(TestCase):
+    def test_pruned_log_expires_a_zero_cursor(self):
+        ItemChange.objects.bulk_create([ItemChange(item_id=n, op=ItemChange.Op.DELETE) for n in range(3)])
+        ItemChange.objects.filter(seq__lt=ItemChange.objects.order_by("-seq")[0].seq).delete()
+        with self.assertRaises(ChangesExpired):
+            changes_since(0)
+
+    def test_entry_committed_below_the_cursor_is_reread(self):
+        first, second = (Item.objects.create(name=name) for name in ("first", "second"))
+        late, seen = ItemChange.objects.bulk_create(
+            [ItemChange(item_id=first.pk, op=ItemChange.Op.UPSERT), ItemChange(item_id=second.pk, op=ItemChange.Op.UPSERT)]
+        )
+        # The client already holds `seen`; `late` only became visible afterwards.
+        delta = changes_since(seen.seq)
+        self.assertEqual(delta["seq"], seen.seq)
+        self.assertEqual({row["id"] for row in delta["upserted"]}, {first.pk, second.pk})
+
+        with override_settings(ITEMS_CHANGES_REREAD=0):
+            self.assertEqual(changes_since(seen.seq)["upserted"], [])
+
+
+@override_settings(COMPRESSION_MIN_SIZE=0, THROTTLE_BUCKETS={})
+class CompressionTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("reader@example.com", "pw-Unused-123")
+
+    def test_token_responses_are_not_compressed(self):
+        response = self.client.post(
+            "/api/auth/login/", {"email": "reader@example.com", "password": "pw-Unused-123"},
+            content_type="application/json", HTTP_ACCEPT_ENCODING="gzip",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.json())
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_other_responses_are_compressed(self):
+        response = self.client.get(
+            "/api/users/me/", HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+
+class ServerTimingTests(TestCase):
+    def get_me(self, user):
+        return self.client.get("/api/users/me/", HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+    def test_only_staff_see_server_timing(self):
+        user = get_user_model().objects.create_user("reader@example.com", "pw-Unused-123")
+        admin = get_user_model().objects.create_superuser("admin@example.com", "pw-Unused-123")
+        self.assertFalse(self.get_me(user).has_header("Server-Timing"))
+        self.assertIn("db;dur=", self.get_me(admin)["Server-Timing"])
+        with override_settings(DEBUG=True):
+            self.assertTrue(self.get_me(user).has_header("Server-Timing"))
+
+
+class EstimateCountTests(TestCase):
+    def test_postgres_estimate_quotes_mixed_case_table_names(self):
+        fake = mock.MagicMock(vendor="postgresql", ops=connection.ops)
+        cursor = fake.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (42,)
+        with mock.patch("api.pagination.connections", {"default": fake}):
+            self.assertEqual(estimate_count(get_user_model().objects.all()), 42)
+        sql, params = cursor.execute.call_args.args
+        self.assertIn("::regclass", sql)
+        self.assertEqual(params, ['"Users_user"'])
@@ -0,0 +1,165 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """'10/min' → seconds between tokens (0.1 tokens/s → 6.0)."""
+    count, _, period = rate.partition("/")
+    return _PERIODS[period[0]] / int(count)
+
+
+class LocalThrottleStore:
+    """
+    Per-process GCRA buckets (a token bucket kept as one timestamp per key: the
+    "theoretical arrival time" at which the bucket is full again).
+    Keys whose bucket has refilled are equivalent to absent ones and are pruned once
+    THROTTLE_LOCAL_MAX_KEYS is reached; past that the oldest keys are dropped.
+    """
+
+    def __init__(self):
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, interval, burst):
+        now = time.monotonic()
+        with self._lock:
+            tat = max(self._buckets.get(key, now), now) + interval
+            excess = tat - now - burst * interval
+            if excess > 0:
+                return False, excess
+            self._buckets[key] = tat
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > settings.THROTTLE_LOCAL_MAX_KEYS:
+                self._prune(now)
+        return True, 0.0
+
+    def _prune(self, now):
+        for key in [key for key, tat in self._buckets.items() if tat <= now]:
+            del self._buckets[key]
+        while len(self._buckets) > settings.THROTTLE_LOCAL_MAX_KEYS:
+            self._buckets.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheThrottleStore:
+    """
+    GCRA buckets in a shared Django cache (THROTTLE_CACHE_ALIAS), for several workers.
+    The arrival time is kept in integer milliseconds and advanced with the backend's
+    atomic `incr`; a rejected request gives its increment back with `decr`. Only an
+    idle key (whose bucket has refilled) is rewritten with a plain `set`, so a race
+    there can at worst let a few extra requests through a full bucket.
+    """
+
+    def __init__(self, alias=None):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias or settings.THROTTLE_CACHE_ALIAS]
+
+    def consume(self, key, interval, burst):
+        cache = self.cache
+        now = int(time.time() * 1000)
+        step = int(interval * 1000)
+        window = burst * step
+
+        if cache.add(key, now + step, timeout=math.ceil(window / 1000) + 1):
+            return True, 0.0
+        try:
+            tat = cache.incr(key, step)
+        except ValueError:  # expired between add() and incr()
+            tat = None
+        if tat is None or tat < now + step:
+            tat = now + step
+            cache.set(key, tat, timeout=math.ceil(step / 1000) + 1)
+            return True, 0.0
+
+        excess = tat - now - window
+        if excess > 0:
+            cache.decr(key, step)
+            return False, excess / 1000
+        # Keep the key until its bucket has refilled.
+        cache.touch(key, timeout=math.ceil((tat - now) / 1000) + 1)
+        return True, 0.0
+
+
+_stores = {}
+
+
+def get_throttle_store():
+    name = settings.THROTTLE_STORE
+    if name not in _stores:
+        _stores[name] = {"local": LocalThrottleStore, "cache": CacheThrottleStore}[name]()
+    return _stores[name]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token-bucket throttle configured per view scope.
+    A view sets `throttle_scope`; THROTTLE_BUCKETS[scope][kind] gives `(rate, burst)`:
+    a client may send `burst` requests at once, then one per rate interval. Views whose
+    scope has no bucket for this throttle's `kind` are not limited by it.
+    DRF checks throttles in `initial()`, so rejected requests never reach a serializer
+    or the password hasher.
+    """
+    kind = None
+
+    def get_key(self, request, view):
+        raise NotImplementedError(".get_key() must be overridden")
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        bucket = settings.THROTTLE_BUCKETS.get(scope, {}).get(self.kind)
+        if bucket is None:
+            return True
+        key = self.get_key(request, view)
+        if key is None:
+            return True
+        rate, burst = bucket
+        allowed, self._wait = get_throttle_store().consume(
+            f"throttle:{scope}:{self.kind}:{key}", parse_rate(rate), burst
+        )
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class IPBucketThrottle(TokenBucketThrottle):
+    """
+    Bucket per client address: REMOTE_ADDR, or with NUM_PROXIES trusted proxies in front,
+    the X-Forwarded-For entry the outermost of them appended. DRF's get_ident() trusts the
+    whole client-supplied header when NUM_PROXIES is unset, so it isn't used here.
+    """
+    kind = "ip"
+
+    def get_key(self, request, view):
+        num_proxies = api_settings.NUM_PROXIES or 0
+        forwarded = request.META.get("HTTP_X_FORWARDED_FOR")
+        if num_proxies and forwarded:
+            addresses = [address.strip() for address in forwarded.split(",")]
+            return addresses[-min(num_proxies, len(addresses))]
+        return request.META.get("REMOTE_ADDR")
+
+
+class EmailBucketThrottle(TokenBucketThrottle):
+    """Bucket per submitted account email, so one account can't be brute-forced from many addresses."""
+    kind = "email"
+
+    def get_key(self, request, view):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return email.strip().lower()
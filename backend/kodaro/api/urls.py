@@ -1,28 +1,40 @@
 from django.urls import path
-from .views import ItemsView
-from rest_framework_simplejwt.views import TokenRefreshView
-from Users.views import (
-    ChangePasswordView,
-    LoginView,
-    LogoutView,
-    MeView,
-    RegisterView,
-    UserDetailView,
-    UserListView,
-)
+
+from .lazy import lazy_view
+
+# Views are imported on first use (see lazy_view) to keep worker startup light.
 urlpatterns = [
-    path('items/', ItemsView.as_view(), name='items'),
+    path('items/', lazy_view("api.views.ItemsView"), name='items'),
+    path('items/bulk/', lazy_view("api.views.ItemsBulkView"), name='items-bulk'),
+    path('items/batch/', lazy_view("api.views.ItemsBatchView"), name='items-batch'),
+    path('items/export/', lazy_view("api.views.ItemsExportView"), name='items-export'),
+    path('items/changes/', lazy_view("api.views.ItemChangesView"), name='items-changes'),
     # ── Auth ──────────────────────────────────────────────────────────────────
-    path("auth/register/", RegisterView.as_view(), name="auth-register"),
-    path("auth/login/", LoginView.as_view(), name="auth-login"),
-    path("auth/logout/", LogoutView.as_view(), name="auth-logout"),
-    path("auth/token/refresh/", TokenRefreshView.as_view(), name="token-refresh"),
+    path("auth/register/", lazy_view("Users.views.RegisterView"), name="auth-register"),
+    path("auth/login/", lazy_view("Users.views.LoginView"), name="auth-login"),
+    path("auth/logout/", lazy_view("Users.views.LogoutView"), name="auth-logout"),
+    path("auth/token/refresh/", lazy_view("Users.views.TokenRefreshView"), name="token-refresh"),
 
     # ── Current user ──────────────────────────────────────────────────────────
-    path("users/me/", MeView.as_view(), name="user-me"),
-    path("users/me/change-password/", ChangePasswordView.as_view(), name="user-change-password"),
+    path("users/me/", lazy_view("Users.views.MeView"), name="user-me"),
+    path("users/me/change-password/", lazy_view("Users.views.ChangePasswordView"), name="user-change-password"),
 
     # ── Admin ─────────────────────────────────────────────────────────────────
-    path("users/", UserListView.as_view(), name="user-list"),
-    path("users/<uuid:pk>/", UserDetailView.as_view(), name="user-detail"),
+    path("users/", lazy_view("Users.views.UserListView"), name="user-list"),
+    path("users/export/", lazy_view("Users.views.UserExportView"), name="user-export"),
+    path("users/bulk/", lazy_view("Users.views.UserBulkView"), name="user-bulk"),
+    path("users/batch/", lazy_view("Users.views.UserBatchView"), name="user-batch"),
+    path("users/<uuid:pk>/", lazy_view("Users.views.UserDetailView"), name="user-detail"),
+    path("metrics/", lazy_view("api.views.PerformanceMetricsView"), name="perf-metrics"),
+
+    # ── Async (ASGI-native) read endpoints ────────────────────────────────────
+    path("async/items/", lazy_view("api.async_views.AsyncItemsView", is_async=True), name="async-items"),
+    path(
+        "async/items/changes/stream/",
+        lazy_view("api.async_views.AsyncItemChangesStreamView", is_async=True),
+        name="async-items-changes-stream",
+    ),
+    path("async/users/me/", lazy_view("Users.async_views.AsyncMeView", is_async=True), name="async-user-me"),
+    path("async/users/", lazy_view("Users.async_views.AsyncUserListView", is_async=True), name="async-user-list"),
+    path("async/users/<uuid:pk>/", lazy_view("Users.async_views.AsyncUserDetailView", is_async=True), name="async-user-detail"),
 ]
\ No newline at end of file
@@ -1,18 +1,167 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
 from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from Users.authentication import StatelessJWTAuthentication
+from .batch import BatchView
+from .cache import items_list_cache
+from .changes import changes_since, head_seq, parse_seq
+from .exports import ExportView
+from .instrumentation import registry, timed
 from .models import Item
-from .serializers import ItemSerializer
+from .pagination import ItemCursorPagination
+from .search import search_items
+from .serializers import ItemSerializer, parse_fields
 
 
 class ItemsView(APIView):
+    """
+    GET  /items/   → List items.
+                     `?page_size=` / `?cursor=` switch to keyset pagination ordered by id.
+                     `?fields=id,name` limits both the SELECT and the serialized columns.
+                     Rows are read with `.values()` and returned as plain dicts.
+                     `?q=` full-text search, `?prefix=` name prefix, `?name=` exact name.
+                     JSON bodies are served from a versioned cache with a content ETag, so
+                     If-None-Match polls of a cached page get a 304 without a DB query.
+    POST /items/   → Create an item.
+    """
+    authentication_classes = [StatelessJWTAuthentication]
+    pagination_class = ItemCursorPagination
+
     def get(self, request):
-        items = Item.objects.all()
-        serializer = ItemSerializer(items, many=True)
-        return Response(serializer.data)
+        if request.accepted_renderer.format != "json":
+            return self.list(request)
+
+        key = items_list_cache.key(request)
+        entry = items_list_cache.get(key)
+        if entry is None:
+            response = self.list(request)
+            content = request.accepted_renderer.render(
+                response.data, request.accepted_media_type, self.get_renderer_context()
+            )
+            entry = items_list_cache.set(key, request.accepted_renderer.media_type, content)
+
+        etag, content_type, content = entry
+        response = get_conditional_response(request, etag=etag) or HttpResponse(content, content_type=content_type)
+        response["ETag"] = etag
+        return response
+
+    def list(self, request):
+        fields = parse_fields(request.query_params, ItemSerializer)
+        items = search_items(Item.objects.order_by("id"), request.query_params)
+        rows = ItemSerializer.values_queryset(items, fields)
+
+        paginator = self.pagination_class()
+        if paginator.is_requested(request):
+            page = paginator.paginate_queryset(rows, request, view=self)
+            with timed("serialize"):
+                data = list(ItemSerializer.values_rows(page, fields))
+            return paginator.get_paginated_response(data)
+
+        with timed("serialize"):
+            data = ItemSerializer.values_data(items, fields)
+        return Response(data)
 
     def post(self, request):
         serializer = ItemSerializer(data=request.data)
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data, status=201)
-        return Response(serializer.errors, status=400)
\ No newline at end of file
+        return Response(serializer.errors, status=400)
+
+
+class ItemsBulkView(APIView):
+    """
+    POST /items/bulk/   → Create many items from a list payload in one transaction.
+                          Valid rows are inserted with `bulk_create`; invalid rows are
+                          skipped and reported by their index in the payload; the
+                          response is 201 if any row was created and 400 otherwise.
+                          `?batch_size=` overrides ITEMS_BULK_BATCH_SIZE (rows per INSERT).
+    """
+
+    def post(self, request):
+        serializer = ItemSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.ITEMS_BULK_MAX_ROWS,
+            context={"request": request, "batch_size": self.get_batch_size(request)},
+        )
+        serializer.is_valid(raise_exception=True)
+        created = serializer.save() if serializer.validated_data else []
+        return Response(
+            {"created": len(created), "errors": serializer.row_errors},
+            status=201 if created else 400,
+        )
+
+    def get_batch_size(self, request):
+        try:
+            batch_size = int(request.query_params["batch_size"])
+        except (KeyError, ValueError):
+            return None
+        return max(1, min(batch_size, settings.ITEMS_BULK_MAX_ROWS))
+
+
+class ItemChangesView(APIView):
+    """
+    GET /items/changes/   → Items changed since a point in the change log.
+                            Without `?since=` only the current `seq` is returned: read it before
+                            a full items/ load, then poll with `?since=<seq>` for the delta.
+                            `upserted` holds the current rows (`?fields=` applies), `deleted` the
+                            removed ids; pass the returned `seq` next time and repeat at once while
+                            `has_more` is true. 410 means the cursor was pruned: reload and restart.
+                            Changes from the last few seconds may be sent again; apply them as usual.
+    """
+    authentication_classes = [StatelessJWTAuthentication]
+
+    def get(self, request):
+        since = parse_seq(request.query_params.get("since"))
+        if since is None:
+            return Response({"seq": head_seq(), "has_more": False, "upserted": [], "deleted": []})
+        fields = parse_fields(request.query_params, ItemSerializer)
+        return Response(changes_since(since, self.get_limit(request), fields))
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params["limit"])
+        except (KeyError, ValueError):
+            return None
+        return max(1, min(limit, settings.ITEMS_CHANGES_PAGE_SIZE))
+
+
+class ItemsBatchView(BatchView):
+    """
+    GET  /items/batch/?ids=1,2,3   → Fetch many items by id in one round trip.
+    POST /items/batch/             → Same, with the ids in the body: {"ids": [...]}.
+                                     Returns {"results": [...], "missing": [...]}; up to ITEMS_BATCH_MAX_IDS ids.
+    """
+    serializer_class = ItemSerializer
+    queryset = Item.objects.all()
+    max_ids = settings.ITEMS_BATCH_MAX_IDS
+
+
+class ItemsExportView(ExportView):
+    """
+    GET /items/export/   → Stream every item as NDJSON (default) or CSV (`?format=csv`).
+    """
+    serializer_class = ItemSerializer
+    queryset = Item.objects.order_by("id")
+    filename = "items"
+
+
+class PerformanceMetricsView(APIView):
+    """
+    GET    /metrics/   → Per-URL-name latency/DB histograms collected by PerformanceMiddleware
+                         in this worker process (admin only).
+    DELETE /metrics/   → Reset them.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(registry.snapshot())
+
+    def delete(self, request):
+        registry.reset()
+        return Response(status=204)
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 from datetime import timedelta
 
@@ -17,6 +19,11 @@ from datetime import timedelta
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
+def _env_int(name, default=None):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/6.0/howto/deployment/checklist/
 
@@ -26,6 +33,9 @@ SECRET_KEY = 'django-insecure-rjau=to3l2krwel30eaklp+fxmp+264=96%uvwk+yxb0^6(oo4
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+# `manage.py test`: background work that would outlive the test database runs inline instead.
+TESTING = sys.argv[1:2] == ["test"]
+
 ALLOWED_HOSTS = []
 
 
@@ -47,16 +57,13 @@ INSTALLED_APPS = [
     # apps
     'api',
     'Users',
+    'taskqueue',
 ]
 
-REST_FRAMEWORK = {
-    'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
-    ],
-}
-
 MIDDLEWARE = [
+    'api.middleware.PerformanceMiddleware',
+    'api.middleware.CompressionMiddleware',
+    'api.middleware.ReplicaPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -66,7 +73,27 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-# ── DRF defaults to JWT authentication ───────────────────────────────────────
+# ── Performance instrumentation (api.middleware.PerformanceMiddleware) ───────
+PERF_INSTRUMENTATION = True
+PERF_NPLUSONE_THRESHOLD = 5    # identical SQL statements per request before logging an N+1
+
+# ── Response compression (api.middleware.CompressionMiddleware) ──────────────
+COMPRESSION_ENCODINGS = ["zstd", "br", "gzip"]   # server preference; zstd/br need `zstandard`/`brotli` installed
+COMPRESSION_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+COMPRESSION_MIN_SIZE = 1024                      # bytes; smaller bodies aren't worth the CPU
+COMPRESSION_STREAM_FLUSH_SIZE = 16 * 1024        # input bytes between flushes of a streamed body
+COMPRESSION_CONTENT_TYPES = [                    # prefixes; text/event-stream stays out so events aren't held back
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/html",
+    "text/plain",
+]
+# Responses carrying secrets next to attacker-influenced input are never compressed, since
+# their compressed size would leak the secret (BREACH): these endpoints all return tokens.
+COMPRESSION_EXCLUDED_URL_NAMES = ["auth-login", "auth-register", "token-refresh"]
+
+# ── DRF defaults: JWT authentication, orjson rendering/parsing ────────────────
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
@@ -74,6 +101,19 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # The browsable API is only offered while DEBUG is on.
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.ORJSONRenderer",
+        *(["rest_framework.renderers.BrowsableAPIRenderer"] if DEBUG else []),
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # Reverse proxies in front of the app whose X-Forwarded-For entries are trusted
+    # (api.throttling.IPBucketThrottle); 0 keys clients on REMOTE_ADDR.
+    "NUM_PROXIES": int(os.environ.get("KODARO_NUM_PROXIES", "0")),
 }
 
 # ── JWT settings ─────────────────────────────────────────────────────────────
@@ -82,11 +122,96 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True,       # issue a new refresh token on every refresh
     "BLACKLIST_AFTER_ROTATION": True,    # blacklist the old one immediately
-    "UPDATE_LAST_LOGIN": True,
+    "UPDATE_LAST_LOGIN": False,          # logins are buffered by Users.activity.last_login_recorder
     "AUTH_HEADER_TYPES": ("Bearer",),
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
+    "TOKEN_REFRESH_SERIALIZER": "Users.serializers.CachedTokenRefreshSerializer",
+}
+
+# Users.blacklist.TokenBlacklist: cache in front of the token_blacklist tables.
+# The Bloom filter short-circuits "not blacklisted" lookups; only enable it with a
+# cache alias shared by all workers (see the TokenBlacklist docstring).
+JWT_BLACKLIST_CACHE_ALIAS = "default"
+JWT_BLACKLIST_BLOOM = False
+JWT_BLACKLIST_BLOOM_REFRESH = 60          # seconds between rebuilds from the DB
+JWT_BLACKLIST_BLOOM_CAPACITY = 1_000_000
+JWT_BLACKLIST_BLOOM_ERROR_RATE = 0.001
+
+# ── Auth rate limiting (api.throttling) ──────────────────────────────────────
+# Token buckets per view scope and key kind: (rate, burst). "local" keeps buckets in
+# each process; "cache" shares them through THROTTLE_CACHE_ALIAS, which then needs to
+# be a backend with atomic incr (Redis/Memcached) for limits to hold across workers.
+THROTTLE_STORE = os.environ.get("KODARO_THROTTLE_STORE", "local")   # local | cache
+THROTTLE_CACHE_ALIAS = "default"
+THROTTLE_LOCAL_MAX_KEYS = 100_000
+THROTTLE_BUCKETS = {
+    "login": {"ip": ("30/min", 10), "email": ("10/min", 5)},
+    "register": {"ip": ("10/hour", 5)},
+    "token-refresh": {"ip": ("60/min", 20)},
 }
 
+# ── Background tasks (taskqueue; run `manage.py run_tasks`) ─────────────────
+TASKS_EAGER = False            # run tasks in-process right after the enqueuing transaction commits
+TASKS_MAX_ATTEMPTS = 5
+TASKS_RETRY_BASE = 10          # seconds before the first retry, doubling per attempt
+TASKS_RETRY_MAX = 3600         # cap on the retry delay
+TASKS_LOCK_TIMEOUT = 600       # seconds before a running task of a dead worker is picked up again
+TASKS_BATCH_SIZE = 20          # tasks claimed per poll
+TASKS_POLL_INTERVAL = 1.0      # seconds a worker sleeps when nothing is due
+TASKS_KEEP_DONE = 7 * 86400    # seconds finished tasks are kept before the worker purges them
+
+EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
+DEFAULT_FROM_EMAIL = "no-reply@kodaro.local"
+
+# ── Items API ────────────────────────────────────────────────────────────────
+ITEMS_PAGE_SIZE = 100          # default page size when pagination is requested
+ITEMS_MAX_PAGE_SIZE = 1000     # hard cap on ?page_size=
+ITEMS_BULK_MAX_ROWS = 50000    # largest payload accepted by POST /items/bulk/
+ITEMS_BULK_BATCH_SIZE = 500    # rows per INSERT statement in bulk ingest
+ITEMS_BATCH_MAX_IDS = 1000     # largest id list accepted by items/batch/
+BATCH_LOOKUP_CHUNK_SIZE = 500  # ids per `WHERE id IN (…)` query in items/batch/ and users/batch/
+
+# ── Item change feed (api.changes; prune with `manage.py prune_item_changes`) ──
+ITEMS_CHANGES_PAGE_SIZE = 500             # log entries collapsed per items/changes/ response or SSE event
+ITEMS_CHANGES_RETENTION = 7 * 24 * 3600   # seconds of change log kept; older cursors get 410
+ITEMS_CHANGES_REREAD = 5                  # seconds of entries at or before the cursor re-sent (late commits)
+ITEMS_FEED_POLL_INTERVAL = 1.0            # seconds between head-seq reads by each worker's poller
+ITEMS_FEED_HEARTBEAT = 15                 # seconds of silence before an SSE keep-alive comment
+ITEMS_FEED_RETRY_MS = 3000                # reconnect delay advertised to EventSource clients
+
+# ── Caching ──────────────────────────────────────────────────────────────────
+# Local memory is per process: point ITEMS_CACHE_ALIAS at a shared backend
+# (Redis/Memcached) when running several workers so invalidations reach all of them.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+ITEMS_CACHE_ALIAS = "default"
+ITEMS_CACHE_TIMEOUT = 300      # seconds a rendered items/ page stays cached
+
+# ── Users API ────────────────────────────────────────────────────────────────
+USERS_PAGE_SIZE = 50
+USERS_MAX_PAGE_SIZE = 500
+USERS_BULK_MAX_IDS = 10_000    # largest id list accepted by POST /users/bulk/
+USERS_BULK_CHUNK_SIZE = 1000   # ids per UPDATE / DELETE statement in bulk user operations
+USERS_BATCH_MAX_IDS = 1000     # largest id list accepted by users/batch/
+# Cache for serialized profiles (Users.cache.UserProfileCache). With the local-memory default an
+# invalidation only reaches its own worker, so other workers can serve a stale profile for up to
+# USERS_PROFILE_CACHE_TIMEOUT; use a shared backend (Redis/Memcached) with several workers.
+USERS_CACHE_ALIAS = "default"
+USERS_PROFILE_CACHE_TIMEOUT = 300  # seconds a serialized profile (users/me/, users/<id>/) stays cached
+USERS_LAST_LOGIN_FLUSH_INTERVAL = 0 if TESTING else 10  # seconds buffered last_login values wait before a bulk UPDATE (0: inline)
+USERS_LAST_LOGIN_BUFFER_SIZE = 10_000  # users buffered per process before the login that fills it flushes
+
+# ── Streaming exports ────────────────────────────────────────────────────────
+EXPORT_CHUNK_SIZE = 2000       # rows fetched per round trip by export endpoints
+
+# Users.authentication.StatelessJWTAuthentication: how long a worker trusts its
+# cached is_active/is_staff flags before re-reading them, and the cache bound.
+JWT_USER_STATUS_TTL = 30
+JWT_USER_STATUS_MAX_ENTRIES = 100_000
+
 # Tell Django to use your custom user model
 AUTH_USER_MODEL = "Users.User"
 
@@ -113,13 +238,80 @@ WSGI_APPLICATION = 'kodaro.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
-
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+#
+# KODARO_DB_ENGINE selects the profile:
+#   sqlite          (default) one file tuned for many readers and queued writers:
+#                   WAL journal, synchronous=NORMAL, busy timeout, mmap, BEGIN IMMEDIATE.
+#   sqlite-default  the same file with stock Django/SQLite settings (for comparison).
+#   postgres        psycopg 3 with Django's native connection pool when
+#                   KODARO_DB_POOL_MAX_SIZE is set, otherwise persistent connections.
+# Compare them with `manage.py bench_db_writes`.
+
+DB_ENGINE = os.environ.get("KODARO_DB_ENGINE", "sqlite")
+
+if DB_ENGINE == "postgres":
+    DB_POOL_MAX_SIZE = _env_int("KODARO_DB_POOL_MAX_SIZE")
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get("KODARO_DB_NAME", "kodaro"),
+            'USER': os.environ.get("KODARO_DB_USER", ""),
+            'PASSWORD': os.environ.get("KODARO_DB_PASSWORD", ""),
+            'HOST': os.environ.get("KODARO_DB_HOST", ""),
+            'PORT': os.environ.get("KODARO_DB_PORT", ""),
+            # Django doesn't allow persistent connections together with the pool.
+            'CONN_MAX_AGE': 0 if DB_POOL_MAX_SIZE else _env_int("KODARO_DB_CONN_MAX_AGE", 60),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
     }
-}
+    if DB_POOL_MAX_SIZE:
+        DATABASES['default']['OPTIONS']['pool'] = {
+            "min_size": _env_int("KODARO_DB_POOL_MIN_SIZE", 2),
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": _env_int("KODARO_DB_POOL_TIMEOUT", 10),
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get("KODARO_DB_NAME", BASE_DIR / 'db.sqlite3'),
+        }
+    }
+    if DB_ENGINE == "sqlite":
+        DATABASES['default']['OPTIONS'] = {
+            # Seconds a writer waits for the lock before "database is locked".
+            'timeout': _env_int("KODARO_SQLITE_BUSY_TIMEOUT", 20),
+            # Take the write lock at BEGIN, so writers queue on the busy timeout
+            # instead of failing when a read transaction tries to upgrade.
+            'transaction_mode': 'IMMEDIATE',
+            # Run on every new connection.
+            'init_command': ";".join([
+                "PRAGMA journal_mode=WAL",
+                "PRAGMA synchronous=NORMAL",
+                f"PRAGMA mmap_size={_env_int('KODARO_SQLITE_MMAP_SIZE', 256 * 1024 * 1024)}",
+                "PRAGMA temp_store=MEMORY",
+            ]),
+        }
+
+# Read replicas (api.routers.ReplicaRouter)
+# KODARO_DB_REPLICAS is a comma-separated list of replica hosts (postgres, host[:port])
+# or database files (sqlite, e.g. two local files as stand-ins). Each becomes an alias
+# replica1, replica2, ... sharing the primary's other settings; tests mirror the primary.
+REPLICA_DATABASES = []
+for _index, _target in enumerate(filter(None, os.environ.get("KODARO_DB_REPLICAS", "").split(",")), start=1):
+    _replica = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+    if DB_ENGINE == "postgres":
+        _replica['HOST'], _, _port = _target.partition(":")
+        _replica['PORT'] = _port or _replica['PORT']
+    else:
+        _replica['NAME'] = _target
+    DATABASES[f"replica{_index}"] = _replica
+    REPLICA_DATABASES.append(f"replica{_index}")
+
+DATABASE_ROUTERS = ["api.routers.ReplicaRouter"]
+REPLICA_READ_STRATEGY = os.environ.get("KODARO_DB_REPLICA_STRATEGY", "round_robin")  # round_robin | least_loaded
+REPLICA_PIN_SECONDS = 5        # how long a client reads from the primary after writing
 
 
 # Password validation
@@ -141,6 +333,44 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# KODARO_PASSWORD_HASHER picks the preferred hasher (pbkdf2 | scrypt | argon2); the
+# others stay installed so existing hashes verify and are upgraded on next login.
+# Costs are tunable per environment; lowering them trades security for login CPU.
+
+PASSWORD_HASHER = os.environ.get("KODARO_PASSWORD_HASHER", "pbkdf2")
+
+# Unset (None) parameters fall back to Django's defaults for that hasher.
+PASSWORD_HASHING_COST = {
+    "pbkdf2": {
+        "iterations": _env_int("KODARO_PBKDF2_ITERATIONS"),
+    },
+    "scrypt": {
+        "work_factor": _env_int("KODARO_SCRYPT_WORK_FACTOR"),
+        "block_size": _env_int("KODARO_SCRYPT_BLOCK_SIZE"),
+        "parallelism": _env_int("KODARO_SCRYPT_PARALLELISM"),
+    },
+    "argon2": {
+        "time_cost": _env_int("KODARO_ARGON2_TIME_COST"),
+        "memory_cost": _env_int("KODARO_ARGON2_MEMORY_COST"),
+        "parallelism": _env_int("KODARO_ARGON2_PARALLELISM"),
+    },
+}
+
+_PASSWORD_HASHER_CLASSES = {
+    "pbkdf2": "Users.hashers.TunedPBKDF2PasswordHasher",
+    "scrypt": "Users.hashers.TunedScryptPasswordHasher",
+    "argon2": "Users.hashers.TunedArgon2PasswordHasher",
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+]
+
+# Bounded pool used by async code paths (Users.hashing) to hash off the event loop.
+PASSWORD_HASHING_EXECUTOR = os.environ.get("KODARO_PASSWORD_HASHING_EXECUTOR", "thread")  # thread | process
+PASSWORD_HASHING_WORKERS = int(os.environ.get("KODARO_PASSWORD_HASHING_WORKERS", os.cpu_count() or 1))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
 
@@ -157,3 +387,36 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
 STATIC_URL = 'static/'
+
+
+# ── API-only profile ─────────────────────────────────────────────────────────
+# KODARO_PROFILE=api-only is for pods that only serve the JWT API: it drops the admin,
+# sessions, messages, static files, CSRF (no cookie-based auth is left to protect),
+# templates and the browsable API, so workers import and hold less. Run admin-facing
+# and management processes with the default "full" profile.
+SETTINGS_PROFILE = os.environ.get("KODARO_PROFILE", "full")   # full | api-only
+
+if SETTINGS_PROFILE == "api-only":
+    INSTALLED_APPS = [
+        app for app in INSTALLED_APPS
+        if app not in {
+            'django.contrib.admin',
+            'django.contrib.sessions',
+            'django.contrib.messages',
+            'django.contrib.staticfiles',
+        }
+    ]
+    MIDDLEWARE = [
+        middleware for middleware in MIDDLEWARE
+        if middleware not in {
+            'django.contrib.sessions.middleware.SessionMiddleware',
+            'django.middleware.csrf.CsrfViewMiddleware',
+            'django.contrib.auth.middleware.AuthenticationMiddleware',
+            'django.contrib.messages.middleware.MessageMiddleware',
+            'django.middleware.clickjacking.XFrameOptionsMiddleware',
+        }
+    ]
+    TEMPLATES = []
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = ["api.renderers.ORJSONRenderer"]
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = ["api.renderers.ORJSONParser"]
+    USE_I18N = False
@@ -0,0 +1,55 @@
+import os
+import signal
+import socket
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.routers import use_primary
+from taskqueue.queue import purge_finished, run_due
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background tasks. Polls for due tasks in batches until stopped "
+        "(SIGINT/SIGTERM finish the current batch first); --once drains the queue and exits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit once no task is due.")
+        parser.add_argument("--batch-size", type=int, default=settings.TASKS_BATCH_SIZE, help="Tasks claimed per poll.")
+        parser.add_argument(
+            "--poll-interval", type=float, default=settings.TASKS_POLL_INTERVAL,
+            help="Seconds to sleep when no task is due.",
+        )
+        parser.add_argument("--worker-id", default=f"{socket.gethostname()}:{os.getpid()}")
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        worker = options["worker_id"]
+        total = 0
+        next_purge = 0.0
+        # Claims and the task bodies read their own writes, so keep them off the replicas.
+        with use_primary():
+            while not self.stopping:
+                ran = run_due(worker, options["batch_size"])
+                total += ran
+                if ran:
+                    continue
+                if options["once"]:
+                    break
+                if time.monotonic() >= next_purge:
+                    purge_finished(timezone.now() - timedelta(seconds=settings.TASKS_KEEP_DONE))
+                    next_purge = time.monotonic() + 3600
+                time.sleep(options["poll_interval"])
+
+        self.stdout.write(f"Ran {total} task(s).")
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,127 @@
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger("kodaro.tasks")
+
+_registry = {}
+
+
+class TaskFunction:
+    """
+    A function registered with @task. Calling it runs it inline; `enqueue()` stores
+    a Task row for a worker (`manage.py run_tasks`) and returns immediately.
+    """
+
+    def __init__(self, func, name, max_attempts):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.__doc__ = func.__doc__
+
+    def __call__(self, **kwargs):
+        return self.func(**kwargs)
+
+    def enqueue(self, *, idempotency_key=None, delay=None, **kwargs):
+        """
+        Queue a call with JSON-serializable `kwargs`. The row is written in the caller's
+        transaction, so the task exists exactly when the caller's own writes commit.
+        A repeated `idempotency_key` is ignored (one INSERT … ON CONFLICT DO NOTHING).
+        """
+        task = Task(
+            name=self.name,
+            kwargs=kwargs,
+            idempotency_key=idempotency_key,
+            max_attempts=self.max_attempts,
+            run_at=timezone.now() + (delay or timedelta()),
+        )
+        Task.objects.bulk_create([task], ignore_conflicts=idempotency_key is not None)
+        if settings.TASKS_EAGER:
+            transaction.on_commit(lambda: run_due(worker="eager", limit=settings.TASKS_BATCH_SIZE))
+
+
+def task(func=None, *, name=None, max_attempts=None):
+    """Register `func` as a task, by default under its dotted path."""
+
+    def register(func):
+        task_name = name or f"{func.__module__}.{func.__qualname__}"
+        registered = TaskFunction(func, task_name, max_attempts or settings.TASKS_MAX_ATTEMPTS)
+        _registry[task_name] = registered
+        return registered
+
+    return register(func) if func is not None else register
+
+
+def backoff(attempts):
+    """Delay before retry number `attempts`: exponential from TASKS_RETRY_BASE, capped, with jitter."""
+    delay = min(settings.TASKS_RETRY_BASE * 2 ** (attempts - 1), settings.TASKS_RETRY_MAX)
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+def claim(worker, limit):
+    """
+    Mark up to `limit` due tasks as running for `worker` and return them.
+    Tasks left running longer than TASKS_LOCK_TIMEOUT (a worker died mid-task) are due again.
+    On Postgres, SKIP LOCKED lets concurrent workers claim disjoint batches without waiting.
+    """
+    now = timezone.now()
+    due = Q(status=Task.Status.PENDING, run_at__lte=now) | Q(
+        status=Task.Status.RUNNING, locked_at__lt=now - timedelta(seconds=settings.TASKS_LOCK_TIMEOUT)
+    )
+    with transaction.atomic():
+        ids = list(
+            Task.objects.filter(due).select_for_update(skip_locked=True).order_by("run_at").values_list("id", flat=True)[:limit]
+        )
+        Task.objects.filter(due, id__in=ids).update(
+            status=Task.Status.RUNNING, locked_by=worker, locked_at=now, attempts=F("attempts") + 1
+        )
+    return list(Task.objects.filter(id__in=ids, status=Task.Status.RUNNING, locked_by=worker, locked_at=now))
+
+
+def execute(task_row):
+    """Run one claimed task and record the outcome: done, retry later, or failed."""
+    func = _registry.get(task_row.name)
+    try:
+        if func is None:
+            raise LookupError(f"No task registered as {task_row.name!r}.")
+        func(**task_row.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if task_row.attempts < task_row.max_attempts:
+            logger.warning("Task %s #%s failed (attempt %d), retrying", task_row.name, task_row.pk, task_row.attempts)
+            Task.objects.filter(pk=task_row.pk).update(
+                status=Task.Status.PENDING, run_at=timezone.now() + backoff(task_row.attempts), last_error=error
+            )
+        else:
+            logger.error("Task %s #%s failed permanently:\n%s", task_row.name, task_row.pk, error)
+            Task.objects.filter(pk=task_row.pk).update(
+                status=Task.Status.FAILED, finished_at=timezone.now(), last_error=error
+            )
+        return False
+    Task.objects.filter(pk=task_row.pk).update(status=Task.Status.DONE, finished_at=timezone.now())
+    return True
+
+
+def run_due(worker, limit):
+    """Claim and run one batch of due tasks; returns how many were run."""
+    tasks = claim(worker, limit)
+    for task_row in tasks:
+        execute(task_row)
+    return len(tasks)
+
+
+def purge_finished(older_than, batch_size=1000):
+    """Delete done tasks finished before `older_than`, in short batches. Failed tasks are kept for inspection."""
+    finished = Task.objects.filter(status=Task.Status.DONE, finished_at__lt=older_than)
+    total = 0
+    while ids := list(finished.values_list("id", flat=True)[:batch_size]):
+        total += Task.objects.filter(id__in=ids).delete()[0]
+    return total
@@ -0,0 +1,79 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Task
+from .queue import run_due, task
+
+calls = []
+
+
+@task(name="taskqueue.tests.record")
+def record(value):
+    calls.append(value)
+
+
+@task(name="taskqueue.tests.flaky", max_attempts=2)
+def flaky():
+    raise RuntimeError("boom")
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueued_task_runs_once(self):
+        record.enqueue(value=1)
+        self.assertEqual(calls, [])
+        self.assertEqual(run_due("test", limit=10), 1)
+        self.assertEqual(calls, [1])
+        self.assertEqual(Task.objects.get().status, Task.Status.DONE)
+        self.assertEqual(run_due("test", limit=10), 0)
+
+    def test_idempotency_key_deduplicates(self):
+        record.enqueue(value=1, idempotency_key="same")
+        record.enqueue(value=2, idempotency_key="same")
+        run_due("test", limit=10)
+        self.assertEqual(calls, [1])
+
+    def test_failed_task_is_retried_with_backoff_then_failed(self):
+        flaky.enqueue()
+        run_due("test", limit=10)
+        retry = Task.objects.get()
+        self.assertEqual((retry.status, retry.attempts), (Task.Status.PENDING, 1))
+        self.assertGreater(retry.run_at, timezone.now())
+        self.assertIn("boom", retry.last_error)
+
+        # Not due yet; force it and let the last attempt fail.
+        self.assertEqual(run_due("test", limit=10), 0)
+        Task.objects.update(run_at=timezone.now())
+        run_due("test", limit=10)
+        failed = Task.objects.get()
+        self.assertEqual((failed.status, failed.attempts), (Task.Status.FAILED, 2))
+
+    def test_task_of_dead_worker_is_reclaimed(self):
+        record.enqueue(value=1)
+        Task.objects.update(
+            status=Task.Status.RUNNING, locked_by="gone", locked_at=timezone.now() - timedelta(hours=1), attempts=1
+        )
+        run_due("test", limit=10)
+        self.assertEqual(calls, [1])
+        self.assertEqual(Task.objects.get().attempts, 2)
+
+    @override_settings(THROTTLE_BUCKETS={})
+    def test_register_queues_welcome_email_for_local_worker(self):
+        response = self.client.post(
+            "/api/auth/register/",
+            {"email": "new@example.com", "password": "Xyz12345!!q", "password_confirm": "Xyz12345!!q"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+
+        call_command("run_tasks", "--once", stdout=StringIO())
+        self.assertEqual([message.to for message in mail.outbox], [["new@example.com"]])
+        self.assertFalse(Task.objects.exclude(status=Task.Status.DONE).exists())